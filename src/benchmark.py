@@ -0,0 +1,315 @@
+"""
+MD5の実装の処理速度を測るベンチマーク
+
+使い方：
+  python benchmark.py run [--sizes 0,64,1K] [--output result.json] [--baseline base.json]
+      各実装を入力サイズごとに実行し、bytes/s, blocks/s, 1回あたりの時間の分布, 最大RSSをJSONで出力する。
+      各モジュールのimport時間も測る。
+      --baselineを指定すると、以前の結果と比べて--threshold以上遅くなったものを報告する。
+  python benchmark.py file [--size MB]
+      md5_fileのmmap版と、read()で読み込むループを比較する
+  python benchmark.py chunk [--size MB] [--min-size 2K] [--avg-size 8K] [--max-size 64K]
+      md5_chunkerで、境目を探すだけの場合と、チャンクごとのMD5まで計算する場合の処理速度を測る
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from md5_with_int import MD5, md5_file
+
+
+# 測定する入力サイズ（bytes）
+# 55, 56, 63, 64 はパディングが1ブロックに収まるか・2ブロックになるかの境目
+DEFAULT_SIZES = [0, 55, 56, 63, 64, 1024, 1024 * 1024, 100 * 1024 * 1024]
+
+
+# import時間を測るモジュール
+IMPORT_MODULES = ['md5_core', 'md5_with_int', 'md5']
+
+
+# 実装の名前 -> (16進数のダイジェストを返す関数, 測定する最大の入力サイズ)
+# 子プロセスの中で呼ぶので、各モジュールはここで初めてimportする
+def load_engines():
+    import hashlib
+    import md5
+    import md5_with_int
+
+    return {
+        'md5.py': (md5.md5_hexdigest, 64 * 1024),
+        'md5_with_int': (md5_with_int.md5_hexdigest, 1024 * 1024),
+        'md5_with_int.MD5': (lambda data: md5_with_int.MD5(data).hexdigest(), None),
+        'hashlib': (lambda data: hashlib.md5(data).hexdigest(), None),
+    }
+
+
+# ソート済みのリストのパーセンタイル（最近傍）
+def percentile(sorted_values, p):
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSではbytes、Linuxではkilobytes
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+# 1つの (実装, サイズ) を測定する（最大RSSを分けるため、1ケースごとに新しいプロセスで実行する）
+def run_case(engine, size, min_time, max_calls):
+    import hashlib
+
+    func, _ = load_engines()[engine]
+    data = os.urandom(size)
+    expected = hashlib.md5(data).hexdigest()
+
+    latencies = []
+    total = 0.0
+    while len(latencies) < max_calls and (total < min_time or not latencies):
+        start = time.perf_counter()
+        result = func(data)
+        elapsed = time.perf_counter() - start
+        if not latencies and result != expected:
+            raise AssertionError('{0} returned a wrong digest for {1} bytes'.format(engine, size))
+        latencies.append(elapsed)
+        total += elapsed
+
+    latencies.sort()
+    num_calls = len(latencies)
+    num_blocks = (size + 8) // 64 + 1
+    return {
+        'engine': engine,
+        'size': size,
+        'calls': num_calls,
+        'bytes_per_sec': size * num_calls / total if total else 0.0,
+        'blocks_per_sec': num_blocks * num_calls / total if total else 0.0,
+        'latency_sec': {
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1],
+        },
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+# 新しいインタープリタでmoduleをimportし、-X importtimeの累計時間（秒）の中央値を返す
+def measure_import_time(module, repeat=5):
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import {0}'.format(module)],
+            cwd=src_dir, capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            fields = [field.strip() for field in line.split('|')]
+            if len(fields) == 3 and fields[2] == module:
+                times.append(int(fields[1]) / 1e6)
+    return statistics.median(times)
+
+
+def run(engines, sizes, min_time, max_calls):
+    limits = {name: max_size for name, (_, max_size) in load_engines().items()}
+    results = []
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        for engine in engines:
+            for size in sizes:
+                if limits[engine] is not None and size > limits[engine]:
+                    continue
+                result = pool.apply(run_case, (engine, size, min_time, max_calls))
+                print('{engine:>18} {size:>10} B: {mb:10.3f} MB/s {blocks:12.0f} blocks/s  p50 {p50:.6f} s'.format(
+                    mb=result['bytes_per_sec'] / 1e6, blocks=result['blocks_per_sec'],
+                    p50=result['latency_sec']['p50'], **result), file=sys.stderr)
+                results.append(result)
+
+    imports = []
+    for module in IMPORT_MODULES:
+        seconds = measure_import_time(module)
+        print('{0:>18} import: {1:.6f} s'.format(module, seconds), file=sys.stderr)
+        imports.append({'module': module, 'seconds': seconds})
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+        'imports': imports,
+    }
+
+
+# 以前の結果と比べ、bytes/s（0バイトはblocks/s）やimport時間がthreshold以上遅くなったものを
+# (名前, 以前の速さに対する比) で返す
+def compare(report, baseline, threshold):
+    def key(result):
+        return result['engine'], result['size']
+
+    def speed(result):
+        return result['bytes_per_sec'] if result['size'] else result['blocks_per_sec']
+
+    baseline_results = {key(r): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        base = baseline_results.get(key(result))
+        if base is None or speed(base) == 0:
+            continue
+        ratio = speed(result) / speed(base)
+        if ratio < 1 - threshold:
+            regressions.append(('{0} {1} B'.format(result['engine'], result['size']), ratio))
+
+    baseline_imports = {r['module']: r['seconds'] for r in baseline.get('imports', [])}
+    for result in report.get('imports', []):
+        base = baseline_imports.get(result['module'])
+        if not base or not result['seconds']:
+            continue
+        ratio = base / result['seconds']
+        if ratio < 1 - threshold:
+            regressions.append(('import {0}'.format(result['module']), ratio))
+    return regressions
+
+
+# "1K", "1M" などのサイズを解釈する
+def parse_size(text):
+    units = {'K': 1024, 'M': 1024 * 1024, 'G': 1024 * 1024 * 1024}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+# read()で読み込んだbytesを順にMD5に渡す（md5_fileとの比較用）
+def md5_file_by_read(path, chunk_size=1024 * 1024):
+    md5 = MD5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5
+
+
+# 関数を1回実行し、(経過秒数, 結果) を返す
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_file(size):
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(os.urandom(size))
+        path = f.name
+    try:
+        results = {}
+        for name, func in [('read', md5_file_by_read), ('mmap', md5_file)]:
+            elapsed, md5 = measure(func, path)
+            results[name] = md5.hexdigest()
+            print('{0:>6}: {1:8.3f} s {2:8.2f} MB/s'.format(name, elapsed, size / 1e6 / elapsed))
+        assert results['read'] == results['mmap']
+    finally:
+        os.remove(path)
+
+
+# 境目を探すだけ（MD5は計算しない）で、チャンクの長さのリストを返す
+def chunk_lengths(data, min_size, avg_size, max_size):
+    from md5_chunker import boundary_threshold, find_boundary
+
+    threshold = boundary_threshold(min_size, avg_size)
+    lengths = []
+    with memoryview(data) as view:
+        while view:
+            length = find_boundary(view, min_size, min(len(view), max_size), threshold)
+            lengths.append(length)
+            view = view[length:]
+    return lengths
+
+
+def iter_chunks_of_file(path, min_size, avg_size, max_size):
+    from md5_chunker import iter_chunks
+
+    with open(path, 'rb') as f:
+        return list(iter_chunks(f, min_size, avg_size, max_size))
+
+
+def bench_chunk(size, min_size, avg_size, max_size):
+    data = os.urandom(size)
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(data)
+        path = f.name
+    try:
+        elapsed, lengths = measure(chunk_lengths, data, min_size, avg_size, max_size)
+        print('{0:>10}: {1:8.3f} s {2:8.2f} MB/s'.format('boundaries', elapsed, size / 1e6 / elapsed))
+        elapsed, _ = measure(md5_file, path)
+        print('{0:>10}: {1:8.3f} s {2:8.2f} MB/s'.format('md5', elapsed, size / 1e6 / elapsed))
+        elapsed, chunks = measure(iter_chunks_of_file, path, min_size, avg_size, max_size)
+        print('{0:>10}: {1:8.3f} s {2:8.2f} MB/s'.format('chunk+md5', elapsed, size / 1e6 / elapsed))
+        print('{0} chunks, {1:.0f} bytes on average'.format(len(chunks), size / len(chunks) if chunks else 0.0))
+        assert [length for _, length, _ in chunks] == lengths
+    finally:
+        os.remove(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the MD5 implementations.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run every engine over a matrix of input sizes')
+    run_parser.add_argument('--engines', default=None, help='comma separated engine names (default: all)')
+    run_parser.add_argument('--sizes', default=None, help='comma separated sizes such as 0,64,1K,1M')
+    run_parser.add_argument('--min-time', type=float, default=0.5, help='minimum seconds to spend per case')
+    run_parser.add_argument('--max-calls', type=int, default=1000, help='maximum calls per case')
+    run_parser.add_argument('--output', default=None, help='write the JSON report to this file (default: stdout)')
+    run_parser.add_argument('--baseline', default=None, help='JSON report to compare against')
+    run_parser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown against the baseline')
+
+    file_parser = subparsers.add_parser('file', help='compare md5_file (mmap) with a plain read loop')
+    file_parser.add_argument('--size', type=int, default=16, help='file size in MB')
+
+    chunk_parser = subparsers.add_parser('chunk', help='measure content-defined chunking with per-chunk MD5')
+    chunk_parser.add_argument('--size', type=int, default=4, help='file size in MB')
+    chunk_parser.add_argument('--min-size', default='2K')
+    chunk_parser.add_argument('--avg-size', default='8K')
+    chunk_parser.add_argument('--max-size', default='64K')
+    args = parser.parse_args(argv)
+
+    if args.command == 'file':
+        bench_file(args.size * 1024 * 1024)
+        return 0
+    if args.command == 'chunk':
+        bench_chunk(args.size * 1024 * 1024,
+                    parse_size(args.min_size), parse_size(args.avg_size), parse_size(args.max_size))
+        return 0
+
+    engines = args.engines.split(',') if args.engines else list(load_engines())
+    sizes = [parse_size(s) for s in args.sizes.split(',')] if args.sizes else DEFAULT_SIZES
+    report = run(engines, sizes, args.min_time, args.max_calls)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, ratio in regressions:
+            print('REGRESSION {0}: {1:.1%} of baseline speed'.format(name, ratio), file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
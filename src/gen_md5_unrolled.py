@@ -0,0 +1,63 @@
+"""
+md5_unrolled.py を生成する
+
+calculate_MD5と同じ64ステップを、関数呼び出しやテーブル参照なしに展開したソースを書き出す。
+定数は埋め込み、ローテートはシフトとORとマスク1回で行う。
+補助関数は F = d ^ (b & (c ^ d)), G = c ^ (d & (b ^ c)) と変形している（結果は同じ）。
+各ステップの後に record(A, B, C, D) を呼ぶ版（calculate_MD5_traced）も別の関数として書き出す。
+
+使い方：
+  python gen_md5_unrolled.py    # 同じディレクトリの md5_unrolled.py を書き換える
+"""
+
+import os
+
+from md5_core import SCHEDULE, T
+
+
+HEADER = '''# このファイルは gen_md5_unrolled.py で生成したもの。直接編集しないこと。
+# ステップ4. 算出処理のループ1回分の処理（md5_with_int.calculate_MD5 を展開した高速版）
+
+
+'''
+
+AUXILIARY_FUNCTIONS = [
+    '{d} ^ ({b} & ({c} ^ {d}))',
+    '{c} ^ ({d} & ({b} ^ {c}))',
+    '{b} ^ {c} ^ {d}',
+    '{c} ^ ({b} | (~{d} & 0xFFFFFFFF))',
+]
+
+
+# traced=Trueなら、各ステップの後のバッファを record(A, B, C, D) に渡す版を作る
+def generate_calculate_MD5_fast(traced=False):
+    lines = [
+        'def calculate_MD5_traced(X, A, B, C, D, record):' if traced else 'def calculate_MD5_fast(X, A, B, C, D):',
+        '    ' + ', '.join('x{0}'.format(k) for k in range(16)) + ' = X',
+        '    a, b, c, d = A, B, C, D',
+    ]
+    names = 'abcd'
+    for step, (k, s, i) in enumerate(SCHEDULE):
+        # a, b, c, d の役割は1ステップごとに右へずれる
+        a, b, c, d = (names[(n - step) % 4] for n in range(4))
+        f = AUXILIARY_FUNCTIONS[step // 16].format(b=b, c=c, d=d)
+        lines.append('    t = ({a} + ({f}) + x{k} + 0x{t:08X}) & 0xFFFFFFFF'.format(
+            a=a, f=f, k=k, t=T[i]))
+        lines.append('    {a} = ({b} + ((t << {s} | t >> {r}) & 0xFFFFFFFF)) & 0xFFFFFFFF'.format(
+            a=a, b=b, s=s, r=32 - s))
+        if traced:
+            lines.append('    record(a, b, c, d)')
+    lines.append('    return ((A + a) & 0xFFFFFFFF, (B + b) & 0xFFFFFFFF, (C + c) & 0xFFFFFFFF, (D + d) & 0xFFFFFFFF)')
+    return '\n'.join(lines) + '\n'
+
+
+def generate():
+    return HEADER + generate_calculate_MD5_fast() + '\n\n' + generate_calculate_MD5_fast(traced=True)
+
+
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'md5_unrolled.py')
+
+
+if __name__ == '__main__':
+    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
+        f.write(generate())
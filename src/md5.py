@@ -7,6 +7,8 @@ RFCのソースコードを実行する上で64bit対応するためのテクニ
 http://www.gcd.org/blog/2010/03/556/
 """
 
+import md5_core
+
 ##############################################################
 #基本のビット演算や文字列、ビット、整数、16進数の相互変換メソッド群
 #Pythonはビット演算が独自仕様のため、一般的なビット演算を実現
@@ -46,38 +48,58 @@ def stob(s, e='utf8'):
             b = "0" * (8 - len(b) % 8) + b
         return b
 
+# バイト列をビットに変換
+def bytes_to_bits(data):
+    if len(data) == 0:
+        return ""
+    return itob(int.from_bytes(data, 'big'), len(data) * 8)
+
+# 指定したビット長で、整数をビットにするときの書式（ビット長 -> 書式）
+BIT_FORMATS = {l: '0{0}b'.format(l) for l in range(1, 129)}
+
+def bit_format(l):
+    return BIT_FORMATS[l] if l in BIT_FORMATS else '0{0}b'.format(l)
+
+# AND/OR/XORは、長さを揃えたビットをそれぞれ一度だけ整数にして計算し、
+# 結果を一度だけビットに戻す（ビット長が既に揃っていれば、揃え直さない）
 # ビット演算におけるAND
 def AND(b1, b2, l = None):
     if l != None:
-        b1 = set_blen(b1, l)
-        b2 = set_blen(b2, l)
-        b = itob(btoi(b1) & btoi(b2))
-        return set_blen(b, l)
-    return itob(btoi(b1) & btoi(b2))
+        if len(b1) != l:
+            b1 = set_blen(b1, l)
+        if len(b2) != l:
+            b2 = set_blen(b2, l)
+        return format(int(b1, 2) & int(b2, 2), bit_format(l))
+    return format(int(b1, 2) & int(b2, 2), 'b')
 
 # ビット演算におけるOR
 def OR(b1, b2, l = None):
     if l != None:
-        b1 = set_blen(b1, l)
-        b2 = set_blen(b2, l)
-        b = itob(btoi(b1) | btoi(b2))
-        return set_blen(b, l)
-    return itob(btoi(b1) | btoi(b2))
+        if len(b1) != l:
+            b1 = set_blen(b1, l)
+        if len(b2) != l:
+            b2 = set_blen(b2, l)
+        return format(int(b1, 2) | int(b2, 2), bit_format(l))
+    return format(int(b1, 2) | int(b2, 2), 'b')
 
 # ビット演算におけるXOR
 def XOR(b1, b2, l = None):
     if l != None:
-        b1 = set_blen(b1, l)
-        b2 = set_blen(b2, l)
-        b = itob(btoi(b1) ^ btoi(b2))
-        return set_blen(b, l)
-    return itob(btoi(b1) ^ btoi(b2))
+        if len(b1) != l:
+            b1 = set_blen(b1, l)
+        if len(b2) != l:
+            b2 = set_blen(b2, l)
+        return format(int(b1, 2) ^ int(b2, 2), bit_format(l))
+    return format(int(b1, 2) ^ int(b2, 2), 'b')
 
 # ビット演算におけるNOT
+# '0'と'1'を入れ替える変換表で、1文字ずつではなく文字列全体を一度に変換する
+NOT_TABLE = str.maketrans('01', '10')
+
 def NOT(b1, l=None):
     if l != None:
         b1 = set_blen(b1, l)
-    return "".join(['0' if i == '1' else '1' for i in b1])
+    return b1.translate(NOT_TABLE)
 
 # ビット演算における左シフト
 def L_SHIFT(b1, d, l = None):
@@ -96,22 +118,19 @@ def R_SHIFT(b1, d, l = None):
             return set_blen(b, l)
 
 # ビット演算における左ローテート
+# 1ビットずつずらさず、先頭のdビットを末尾へ一度に付け替える
 def L_ROTATE(b, d):
-    if len(b) == 1:
-        return b
-    else:
-        for _ in range(0,d):
-            b = b[1:] + b[0]
+    if len(b) <= 1:
         return b
+    d %= len(b)
+    return b[d:] + b[:d]
     
 # ビット演算における右ローテート（今回は使わない）
 def R_ROTATE(b, d):
-    if len(b) == 1:
-        return b
-    else:
-        for _ in range(0,d):
-            b = b[-1:] + b[:-1]
+    if len(b) <= 1:
         return b
+    d %= len(b)
+    return b[len(b)-d:] + b[:len(b)-d]
 
 # ビットをバイト毎に反転
 # 10001011010111011100101101010011
@@ -119,10 +138,7 @@ def R_ROTATE(b, d):
 # -> 4:01010011 3:11001011 2:01011101 1:10001011 
 # -> 01010011110010110101110110001011 
 def reverse_bits(bits):
-    reversed_bits = ""
-    for i in range(len(bits)-8, -1 , -8): 
-        reversed_bits += bits[i : i+8]
-    return reversed_bits
+    return "".join([bits[i : i+8] for i in range(len(bits)-8, -1 , -8)])
 
 ##############################################################
 # RFCに則ったMD5の実装
@@ -148,23 +164,38 @@ def add_bits_length(bits, paddinged_bits):
     paddinged_bits += reverse_bits(bits_length)
     return paddinged_bits
 
+# ステップ0〜2. メッセージを512ビットのブロックごとに順に返す
+# メッセージ全体をビットにせず、64バイトずつビットに変換するので、
+# メモリ上にあるビットは常に1〜2ブロック分だけ
+def iter_bits_blocks(string, e='utf8'):
+    data = string.encode(e) if isinstance(string, str) else string
+    view = memoryview(data).cast('B')
+    full_length = len(view) - len(view) % 64
+    for i in range(0, full_length, 64):
+        yield bytes_to_bits(view[i:i+64])
+
+    # 末尾の64バイトに満たない部分にだけ、拡張と長さ付加を行う
+    paddinged_bits = padding_to_bits(bytes_to_bits(view[full_length:]))
+    bits_length = set_blen(itob(len(view) * 8), 64)
+    fixed_paddinged_bits = paddinged_bits + reverse_bits(bits_length)
+    for i in range(0, len(fixed_paddinged_bits), 512):
+        yield fixed_paddinged_bits[i:i+512]
+
 # ステップ3. バッファの初期化
+# 初期値のビットはimport時に一度だけ作っておく
+INITIAL_BUFFER = dict(
+    A = itob(md5_core.INITIAL_STATE[0],32),
+    B = itob(md5_core.INITIAL_STATE[1],32),
+    C = itob(md5_core.INITIAL_STATE[2],32),
+    D = itob(md5_core.INITIAL_STATE[3],32),
+)
+
 def initialize_buffer():
-    buffer = dict(
-        A = htob('0x67452301',32),
-        B = htob('0xefcdab89',32),
-        C = htob('0x98badcfe',32),
-        D = htob('0x10325476',32),
-    )
-    return buffer
+    return dict(INITIAL_BUFFER)
 
-# 計算用数値配列の準備
+# 計算用数値配列の準備（md5_coreのテーブルTをそのまま使う）
 def get_array_for_culculate():
-    T = ['0']
-    from math import sin
-    for i in range (1, 64+1, 1):
-        T.append(int(4294967296 * abs(sin(i))))
-    return T
+    return md5_core.T
 
 # 
 def get_array_X(bits):
@@ -210,68 +241,36 @@ def II(a, b, c, d, x, s, ac):
     return base_calc(a, b, c, d, x, s, ac, I)
 
 
+# テーブルT
+T = get_array_for_culculate()
+
+# 64ステップを4ステップずつに分けた (段階の番号, 4ステップ分の (X[k]のk, ローテート量s, T[i]のi))
+# 各段階のk, s, iはmd5_core.SCHEDULEのものを使い、ブロックごとに計算し直さない
+SCHEDULE_BY_FOUR = tuple((n // 16, md5_core.SCHEDULE[n:n+4]) for n in range(0, 64, 4))
+
 # 算出処理
 def culuculate_MD5(bits, buffer):
-    T = get_array_for_culculate()
     X = get_array_X(bits)
 
-    # 初期値の退避
-    import copy
-    buffer_org = copy.deepcopy(buffer)
-    AA = buffer_org['A']
-    BB = buffer_org['B']
-    CC = buffer_org['C']
-    DD = buffer_org['D']
+    # 初期値の退避（ビットは文字列で書き換えられないので、コピーは不要）
+    AA = buffer['A']
+    BB = buffer['B']
+    CC = buffer['C']
+    DD = buffer['D']
 
     A = buffer['A']
     B = buffer['B']
     C = buffer['C']
     D = buffer['D']
 
-    # 第一段階
-    for i in range(0, 16 , 4):
-        A = FF(A, B, C, D, X[ i  ],  7, T[ i+1])
-        D = FF(D, A, B, C, X[ i+1], 12, T[ i+2])
-        C = FF(C, D, A, B, X[ i+2], 17, T[ i+3])
-        B = FF(B, C, D, A, X[ i+3], 22, T[ i+4])
-    
-    def check_max(i):
-        return i if  i <= 16 else  i - 16
-    def check_min(i):
-        return i if  i >=  0 else  i + 16
-
-    # 第二段階
-    for i in range(0, 16 , 4):
-        x1 = check_max( 1 + i) 
-        x2 = check_max( 6 + i)
-        x3 = check_max(11 + i)
-        x4 = check_max( 0 + i)
-        A = GG(A, B, C, D, X[ x1],  5, T[ i+17])
-        D = GG(D, A, B, C, X[ x2],  9, T[ i+18])
-        C = GG(C, D, A, B, X[ x3], 14, T[ i+19])
-        B = GG(B, C, D, A, X[ x4], 20, T[ i+20])
-    
-    # 第三段階
-    for i in range(0, 16 , 4):
-        x1 = check_min( 5 - i) 
-        x2 = check_min( 8 - i)
-        x3 = check_min(11 - i)
-        x4 = check_min(14 - i)
-        A = HH(A, B, C, D, X[ x1],  4, T[ i+33])
-        D = HH(D, A, B, C, X[ x2], 11, T[ i+34])
-        C = HH(C, D, A, B, X[ x3], 16, T[ i+35])
-        B = HH(B, C, D, A, X[ x4], 23, T[ i+36])
-
-    # 第四段階
-    for i in range(0, 16 , 4):
-        x1 = check_min( 0 - i) 
-        x2 = check_min( 7 - i)
-        x3 = check_min(14 - i)
-        x4 = check_min( 5 - i)
-        A = II(A, B, C, D, X[ x1],  6, T[ i+49])
-        D = II(D, A, B, C, X[ x2], 10, T[ i+50])
-        C = II(C, D, A, B, X[ x3], 15, T[ i+51])
-        B = II(B, C, D, A, X[ x4], 21, T[ i+52])
+    # 第一段階〜第四段階（FF〜IIはmd5_traceが差し替えることがあるので、呼び出しごとに読む）
+    round_functions = (FF, GG, HH, II)
+    for r, ((k1, s1, i1), (k2, s2, i2), (k3, s3, i3), (k4, s4, i4)) in SCHEDULE_BY_FOUR:
+        calc = round_functions[r]
+        A = calc(A, B, C, D, X[k1], s1, T[i1])
+        D = calc(D, A, B, C, X[k2], s2, T[i2])
+        C = calc(C, D, A, B, X[k3], s3, T[i3])
+        B = calc(B, C, D, A, X[k4], s4, T[i4])
 
     result_buffer = dict(
         A = itob(btoi(A) + btoi(AA),32),
@@ -293,74 +292,12 @@ def finalize(buffer):
     return hex_hash
 
 def md5_hexdigest(string):
-    # ステップ0. メッセージのbit化
-    bits = stob(string)
-    # ステップ1. メッセージの拡張
-    paddinged_bits = padding_to_bits(bits)
-    # ステップ2. メッセージに長さ付加
-    fixed_paddinged_bits = add_bits_length(bits,paddinged_bits)
     # ステップ3. バッファの初期化
     buffer = initialize_buffer()
+    # ステップ0〜2. メッセージのbit化・拡張・長さ付加（ブロックごと）
     # ステップ4. 算出処理
-    for i in range(0,len(fixed_paddinged_bits),512):
-        part_bits = fixed_paddinged_bits[i:i+512]
+    for part_bits in iter_bits_blocks(string):
         buffer = culuculate_MD5(part_bits, buffer)
     # ステップ5. 出力
     hex_hash = finalize(buffer)
     return hex_hash
-
-
-##############################################################
-# テスト
-##############################################################    
-
-import hashlib
-
-print("## '' ")
-print(md5_hexdigest(""))
-print(hashlib.md5("".encode('utf8')).hexdigest())
-print("")
-
-print("## 'a' ")
-print(md5_hexdigest("a"))
-print(hashlib.md5("a".encode('utf8')).hexdigest())
-print("")
-
-print("## 'abc' ")
-print(md5_hexdigest("abc"))
-print(hashlib.md5("abc".encode('utf8')).hexdigest())
-print("")
-
-print("## 'message digest' ")
-print(md5_hexdigest("message digest"))
-print(hashlib.md5("message digest".encode('utf8')).hexdigest())
-print("")
-
-print("## 'abcdefghijklmnopqrstuvwxyz' ")
-print(md5_hexdigest("abcdefghijklmnopqrstuvwxyz"))
-print(hashlib.md5("abcdefghijklmnopqrstuvwxyz".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123' ")
-print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123"))
-print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789' ")
-print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"))
-print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789".encode('utf8')).hexdigest())
-print("")
-
-print("## '12345678901234567890123456789012345678901234567890123456789012345678901234567890' ")
-print(md5_hexdigest("12345678901234567890123456789012345678901234567890123456789012345678901234567890"))
-print(hashlib.md5("12345678901234567890123456789012345678901234567890123456789012345678901234567890".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789' ")
-print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"))
-print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ああああああああああああああああああああああああ' ")
-print(md5_hexdigest("ああああああああああああああああああああああああ"))
-print(hashlib.md5("ああああああああああああああああああああああああ".encode('utf8')).hexdigest())
@@ -0,0 +1,97 @@
+"""
+asyncioからMD5を計算する
+
+受け取ったチャンクはイベントループ上ではまとめるだけにして、
+計算（md5_with_int.MD5.update）はbatch_sizeごとにexecutorへ渡す。
+executorにProcessPoolExecutorを渡すと、計算中もイベントループはGILを取り合わずに動き続ける。
+"""
+
+import asyncio
+import base64
+
+from md5_with_int import MD5
+
+
+# executorの中で実行する処理（プロセスをまたぐときはMD5ごと受け渡す）
+def update(md5, data):
+    md5.update(data)
+    return md5
+
+
+# StreamReaderやasync iteratorから、bytesのチャンクを順に取り出す
+async def iter_chunks(source, chunk_size):
+    if hasattr(source, 'read'):
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+# sourceの全体のMD5を計算し、MD5オブジェクトを返す
+async def md5_async(source, batch_size=1024 * 1024, executor=None, chunk_size=64 * 1024):
+    loop = asyncio.get_running_loop()
+    md5 = MD5()
+    pending = []
+    pending_size = 0
+    async for chunk in iter_chunks(source, chunk_size):
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= batch_size:
+            md5 = await loop.run_in_executor(executor, update, md5, b''.join(pending))
+            pending = []
+            pending_size = 0
+    if pending:
+        md5 = await loop.run_in_executor(executor, update, md5, b''.join(pending))
+    return md5
+
+
+# HTTPのContent-MD5ヘッダーの値（ダイジェストのBase64）を返す
+async def content_md5(source, batch_size=1024 * 1024, executor=None):
+    md5 = await md5_async(source, batch_size, executor)
+    return base64.b64encode(md5.digest()).decode('ascii')
+
+
+##############################################################
+# 実行例：計算中にイベントループが止まる時間を測る（テストはtest_md5.py）
+##############################################################
+
+if __name__ == '__main__':
+    import os
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    # 計算中にイベントループが止まった最大の時間を測る
+    async def measure_max_gap(stop, interval=0.001):
+        max_gap = 0.0
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            max_gap = max(max_gap, now - last - interval)
+            last = now
+        return max_gap
+
+    async def main():
+        body = os.urandom(2 * 1024 * 1024 + 123)
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(body)
+        reader.feed_eof()
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            stop = asyncio.Event()
+            gap_task = asyncio.create_task(measure_max_gap(stop))
+            start = time.perf_counter()
+            md5 = await md5_async(reader, batch_size=256 * 1024, executor=executor)
+            elapsed = time.perf_counter() - start
+            stop.set()
+            max_gap = await gap_task
+
+        print('{0} bytes: {1:.3f} s, max event loop stall {2:.1f} ms ({3})'.format(
+            len(body), elapsed, max_gap * 1000, md5.hexdigest()))
+
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+使える中で一番速いMD5の実装を選んで計算する
+
+  md5(data)               # hashlib.md5と同じように使えるオブジェクト（update, digest, hexdigest, copy）
+  md5_many(list_of_bytes) # 複数のメッセージのダイジェスト（16bytes）のリスト
+
+最初に使うときに一度だけ、速い順に実装を試し、RFC 1321のテストベクタで正しく計算できた
+最初のものを使う。
+  1つずつ：hashlib（OpenSSL） > md5_with_int.MD5 > md5.py（参照実装）
+  まとめて：hashlibがなければ、NUMPY_MIN_BATCH個以上の短いメッセージはmd5_numpyでまとめて計算する
+FIPSモードなどでhashlibのMD5が使えない場合や、NumPyがない場合はその実装を飛ばす。
+選んだ結果と、使わなかった理由は selection に残る（python md5_backend.py で表示する）。
+"""
+
+import hashlib
+from functools import lru_cache
+
+from md5 import md5_hexdigest as reference_hexdigest
+from md5_with_int import MD5
+
+
+# RFC 1321 A.5 のテストベクタ（実装を選ぶときに、ここに書いた値と比べる）
+RFC_TEST_VECTORS = [
+    (b'', 'd41d8cd98f00b204e9800998ecf8427e'),
+    (b'a', '0cc175b9c0f1b6a831c399e269772661'),
+    (b'abc', '900150983cd24fb0d6963f7d28e17f72'),
+    (b'message digest', 'f96b697d7cb7938d525a2f31aaf161d0'),
+    (b'abcdefghijklmnopqrstuvwxyz', 'c3fcd3d76192e4007dfb496cca67e13b'),
+    (b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789', 'd174ab98d277d9f5a5611c2c9f419d9f'),
+    (b'1234567890' * 8, '57edf4a22be3c955ac49da2e2107b67a'),
+]
+
+# NumPyでまとめて計算するほうが速くなるメッセージの数と、1つのメッセージの大きさの上限
+NUMPY_MIN_BATCH = 64
+NUMPY_MAX_MESSAGE_SIZE = 64 * 1024
+
+# 実装の名前 -> 'selected', 'ok', 'not checked' または使わない理由
+selection = {}
+
+
+# FIPSモードでも、セキュリティ以外の用途（チェックサムなど）ならMD5を使える
+def hashlib_md5(data=b''):
+    return hashlib.md5(data, usedforsecurity=False)
+
+
+# md5.pyの参照実装は入力全体を一度に受け取るので、update()で渡されたものを溜めておく
+class ReferenceMD5:
+    name = 'md5'
+    digest_size = 16
+    block_size = 64
+
+    def __init__(self, data=b''):
+        self._data = bytearray(data)
+
+    def update(self, data):
+        self._data += data
+
+    def digest(self):
+        return bytes.fromhex(self.hexdigest())
+
+    def hexdigest(self):
+        return reference_hexdigest(bytes(self._data))
+
+    def copy(self):
+        return ReferenceMD5(self._data)
+
+
+# 1つずつ計算する実装（速い順）
+BACKENDS = [
+    ('hashlib', hashlib_md5),
+    ('md5_with_int', MD5),
+    ('md5', ReferenceMD5),
+]
+
+
+# テストベクタを、途中で分けてupdate()したり、copy()した側を変えたりしても正しく計算できるか調べる
+# 問題なければNoneを、あれば理由を返す（どんな例外でも、その実装を使わない理由として残す）
+def check_backend(new):
+    try:
+        for data, expected in RFC_TEST_VECTORS:
+            h = new(data[:3])
+            h.copy().update(b'x')
+            h.update(data[3:])
+            if h.hexdigest() != expected:
+                return 'wrong digest for {0!r}'.format(data)
+    except Exception as e:
+        return '{0}: {1}'.format(type(e).__name__, e)
+    return None
+
+
+# 1つずつ計算する実装のうち、正しく計算できる最初のものを返す
+@lru_cache(maxsize=None)
+def select_backend():
+    chosen = None
+    for name, new in BACKENDS:
+        if chosen is not None:
+            selection.setdefault(name, 'not checked')
+            continue
+        error = check_backend(new)
+        if error is None:
+            chosen = new
+            selection[name] = 'selected'
+        else:
+            selection[name] = error
+    if chosen is None:
+        raise RuntimeError('no working MD5 backend: {0}'.format(selection))
+    return chosen
+
+
+# md5_numpyが使えて正しく計算できればmd5_batchを、そうでなければNoneを返す
+@lru_cache(maxsize=None)
+def select_batch_backend():
+    try:
+        from md5_numpy import md5_batch
+    except ImportError as e:
+        selection['numpy'] = 'ImportError: {0}'.format(e)
+        return None
+    digests = md5_batch([data for data, _ in RFC_TEST_VECTORS])
+    if [row.tobytes().hex() for row in digests] != [expected for _, expected in RFC_TEST_VECTORS]:
+        selection['numpy'] = 'wrong digest'
+        return None
+    selection['numpy'] = 'ok'
+    return md5_batch
+
+
+def md5(data=b''):
+    return select_backend()(data)
+
+
+# 複数のメッセージのMD5をまとめて計算する
+def md5_many(list_of_bytes):
+    new = select_backend()
+    if (new is not hashlib_md5 and len(list_of_bytes) >= NUMPY_MIN_BATCH
+            and max(len(data) for data in list_of_bytes) <= NUMPY_MAX_MESSAGE_SIZE):
+        md5_batch = select_batch_backend()
+        if md5_batch is not None:
+            return [row.tobytes() for row in md5_batch(list_of_bytes)]
+    return [new(data).digest() for data in list_of_bytes]
+
+
+if __name__ == '__main__':
+    select_backend()
+    select_batch_backend()
+    for name, status in selection.items():
+        print('{0:<14} {1}'.format(name, status))
@@ -0,0 +1,90 @@
+"""
+同じ入力に対するMD5の計算結果を覚えておくキャッシュ
+
+  cache = DigestCache(max_entries=1024, max_bytes=64 * 1024 * 1024)
+  cache(data)       # md5_hexdigest_by_blocks(data) と同じ結果
+  cache.hits, cache.misses
+
+- 入力の数（max_entries）と、キャッシュが保持する入力の合計バイト数（max_bytes）の上限を超えたら、
+  最も長く使っていないものから捨てる。
+- identity_threshold以上の大きさのbytesは、中身ではなく (id, 長さ) をキーにする。
+  中身の比較をしないので、検索は入力の大きさによらず定数時間で済む。
+  （キャッシュが入力への参照を持つので、同じidが別のオブジェクトに使い回されることはない）
+- 書き換えられるbytearrayやmemoryviewはidをキーにできないので、大きいものはキャッシュしない。
+- max_input_sizeより大きい入力はキャッシュせずにそのまま計算する。
+"""
+
+from collections import OrderedDict
+
+from md5_with_int import md5_hexdigest_by_blocks
+
+
+class DigestCache:
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, max_input_size=1024 * 1024,
+                 identity_threshold=4096, hexdigest=md5_hexdigest_by_blocks):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_input_size = max_input_size
+        self.identity_threshold = identity_threshold
+        self.hexdigest = hexdigest
+
+        # キー -> (16進数のダイジェスト, 入力の大きさ, idをキーにした入力)
+        self._entries = OrderedDict()
+        self._num_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def _key(self, data):
+        size = len(data)
+        if size < self.identity_threshold:
+            return bytes(data)
+        if type(data) is bytes:
+            return (id(data), size)
+        return None
+
+    def __call__(self, data):
+        size = len(data)
+        key = None
+        if self.max_input_size is None or size <= self.max_input_size:
+            key = self._key(data)
+        if key is None:
+            self.bypasses += 1
+            return self.hexdigest(data)
+
+        entry = self._entries.get(key)
+        if entry is not None and (entry[2] is None or entry[2] is data):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        hex_hash = self.hexdigest(data)
+        if size > self.max_bytes:
+            return hex_hash
+        if entry is not None:
+            self._remove(key)
+        self._entries[key] = (hex_hash, size, data if isinstance(key, tuple) else None)
+        self._num_bytes += size
+        while len(self._entries) > self.max_entries or self._num_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        return hex_hash
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._num_bytes -= size
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def num_bytes(self):
+        return self._num_bytes
+
+    def clear(self):
+        self._entries.clear()
+        self._num_bytes = 0
+
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses, bypasses=self.bypasses,
+                    entries=len(self._entries), bytes=self._num_bytes)
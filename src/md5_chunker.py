@@ -0,0 +1,118 @@
+"""
+内容に応じてファイルをチャンクに分け、チャンクごとのMD5を計算する（重複排除ストレージ向け）
+
+チャンクの境目は、ローリングハッシュ（Gearハッシュ）で決める。
+  h = ((h << 1) + GEAR[バイト]) mod 2**64
+hが閾値より小さくなったところを境目にするので、境目はその手前64bytesの内容だけで決まり、
+ファイルの途中にデータを挿入・削除しても、離れたところの境目は変わらない。
+先頭からmin_sizeバイトは境目を探さず、max_sizeバイトで必ず区切る。
+閾値は、チャンクの大きさの平均がおよそavg_sizeになるように決める。
+
+ファイルはread_sizeずつ読み、手元に置くのは多くともmax_size + read_sizeバイトだけ。
+各チャンクはmd5_with_int.MD5で計算し、(ファイル中の位置, 長さ, ダイジェスト16bytes) を順に返す。
+
+使い方：
+  python md5_chunker.py FILE [--min-size 2048] [--avg-size 8192] [--max-size 65536] [--stats]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from md5_with_int import MD5
+
+
+DEFAULT_MIN_SIZE = 2 * 1024
+DEFAULT_AVG_SIZE = 8 * 1024
+DEFAULT_MAX_SIZE = 64 * 1024
+
+# Gearハッシュで各バイトに割り当てる64bitsの乱数（どの環境でも同じ境目になるように、種を固定する）
+def make_gear_table(seed=0x4D4435):
+    generator = random.Random(seed)
+    return tuple(generator.getrandbits(64) for _ in range(256))
+
+
+GEAR = make_gear_table()
+
+
+# 境目の判定に使う閾値
+# 1バイトごとに 1 / (avg_size - min_size) の確率で境目になるので、
+# min_sizeを過ぎてから境目が見つかるまでのバイト数の平均は avg_size - min_size になる
+def boundary_threshold(min_size, avg_size):
+    return (1 << 64) // (avg_size - min_size)
+
+
+# data[:end] の中で最初の境目までの長さを返す（見つからなければend）
+def find_boundary(data, min_size, end, threshold):
+    if end <= min_size:
+        return end
+    gear = GEAR
+    h = 0
+    for i, byte in enumerate(data[min_size:end], min_size):
+        h = ((h << 1) + gear[byte]) & 0xFFFFFFFFFFFFFFFF
+        if h < threshold:
+            return i + 1
+    return end
+
+
+def check_sizes(min_size, avg_size, max_size):
+    if not 0 < min_size < avg_size < max_size:
+        raise ValueError('chunk sizes must satisfy 0 < min_size < avg_size < max_size')
+
+
+# ファイルをチャンクに分け、(位置, 長さ, ダイジェスト) を順に返す
+def iter_chunks(f, min_size=DEFAULT_MIN_SIZE, avg_size=DEFAULT_AVG_SIZE, max_size=DEFAULT_MAX_SIZE,
+                read_size=1024 * 1024):
+    check_sizes(min_size, avg_size, max_size)
+    threshold = boundary_threshold(min_size, avg_size)
+    buffer = bytearray()
+    offset = 0
+    eof = False
+    while True:
+        # 境目を探すのに、少なくともmax_sizeバイトを手元に置く
+        while not eof and len(buffer) < max_size:
+            data = f.read(read_size)
+            if data:
+                buffer += data
+            else:
+                eof = True
+        if not buffer:
+            return
+
+        length = find_boundary(buffer, min_size, min(len(buffer), max_size), threshold)
+        with memoryview(buffer) as view:
+            digest = MD5(view[:length]).digest()
+        yield offset, length, digest
+        # bytearrayの先頭の削除は、中身を詰め直さずに済む
+        del buffer[:length]
+        offset += length
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Split a file into content-defined chunks and hash each chunk.')
+    parser.add_argument('file')
+    parser.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE)
+    parser.add_argument('--avg-size', type=int, default=DEFAULT_AVG_SIZE)
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE)
+    parser.add_argument('--stats', action='store_true', help='print chunk count, average size and MB/s to stderr')
+    args = parser.parse_args(argv)
+
+    num_chunks = 0
+    total = 0
+    start = time.perf_counter()
+    with open(args.file, 'rb') as f:
+        for offset, length, digest in iter_chunks(f, args.min_size, args.avg_size, args.max_size):
+            print('{0} {1} {2}'.format(offset, length, digest.hex()))
+            num_chunks += 1
+            total += length
+    elapsed = time.perf_counter() - start
+
+    if args.stats:
+        print('{0} chunks, {1:.0f} bytes on average, {2:.2f} MB/s'.format(
+            num_chunks, total / num_chunks if num_chunks else 0.0, total / 1e6 / elapsed if elapsed else 0.0),
+            file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+md5.py, md5_with_int.py, md5_numpy.py などで共通に使う定数
+
+どれもimport時に一度だけ作り、以降はタプルとして読み出すだけにする。
+"""
+
+from math import sin
+
+
+# ステップ3. バッファの初期値 (A, B, C, D)
+INITIAL_STATE = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476)
+
+# テーブルT
+# RFCに合わせてT[1]〜T[64]を使う（T[0]は使わない）
+T = (0,) + tuple(int(4294967296 * abs(sin(i))) & 0xFFFFFFFF for i in range(1, 64 + 1))
+
+# 各段階のローテート量（4ステップごとに繰り返す）
+SHIFTS = (
+    (7, 12, 17, 22),
+    (5, 9, 14, 20),
+    (4, 11, 16, 23),
+    (6, 10, 15, 21),
+)
+
+# 64ステップそれぞれの (X[k]のk, ローテート量s, T[i]のi)
+# 各段階でkは 第一段階: j, 第二段階: 1 + 5j, 第三段階: 5 + 3j, 第四段階: 7j (mod 16) と進む
+SCHEDULE = tuple(
+    ((start + step * j) % 16, SHIFTS[r][j % 4], r * 16 + j + 1)
+    for r, (start, step) in enumerate([(0, 1), (1, 5), (5, 3), (0, 7)])
+    for j in range(16)
+)
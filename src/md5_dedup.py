@@ -0,0 +1,123 @@
+"""
+重複しているファイルを探す
+
+全てのファイルをハッシュせず、段階的に候補を絞り込む：
+  1. 大きさが同じファイルをまとめる
+  2. 先頭と末尾のPARTIAL_SIZEバイトだけのMD5でさらに分ける
+  3. それでも同じものだけ、ファイル全体のMD5を計算する
+2と3はプロセスプールで並列に計算する。
+
+使い方：
+  python md5_dedup.py DIR... [-j JOBS] [--stats]
+"""
+
+import argparse
+import os
+import stat
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from md5_with_int import MD5, md5_file
+
+
+PARTIAL_SIZE = 64 * 1024
+
+
+# 大きさ -> パスのリスト（ハードリンクで同じ実体を指すものは1つだけ数える）
+def group_by_size(roots):
+    groups = {}
+    seen = set()
+    for root in roots:
+        for dirpath, dirs, files in os.walk(root):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    continue
+                if not stat.S_ISREG(st.st_mode) or (st.st_dev, st.st_ino) in seen:
+                    continue
+                seen.add((st.st_dev, st.st_ino))
+                groups.setdefault(st.st_size, []).append(path)
+    return groups
+
+
+# 先頭と末尾のPARTIAL_SIZEバイトのMD5（ファイルが2 * PARTIAL_SIZE以下なら全体のMD5と同じ）
+# 大きさを調べた後に削除された・読めなくなったファイルはNoneを返す
+def partial_digest(path, size):
+    md5 = MD5()
+    try:
+        with open(path, 'rb') as f:
+            if size <= 2 * PARTIAL_SIZE:
+                md5.update(f.read())
+            else:
+                md5.update(f.read(PARTIAL_SIZE))
+                f.seek(size - PARTIAL_SIZE)
+                md5.update(f.read(PARTIAL_SIZE))
+    except OSError:
+        return None
+    return md5.digest()
+
+
+def full_digest(path):
+    try:
+        return md5_file(path).digest()
+    except OSError:
+        return None
+
+
+# pathsをfuncの結果でさらに分け、2つ以上あるものだけを返す（結果がNoneのファイルは除く）
+def split_groups(executor, func, groups_of_paths, *args):
+    all_paths = [path for paths in groups_of_paths for path in paths]
+    all_args = [[arg_of(path) for path in all_paths] for arg_of in args]
+    digests = iter(executor.map(func, all_paths, *all_args, chunksize=16))
+    result = []
+    for paths in groups_of_paths:
+        by_digest = {}
+        for path in paths:
+            digest = next(digests)
+            if digest is not None:
+                by_digest.setdefault(digest, []).append(path)
+        result.extend(group for group in by_digest.values() if len(group) >= 2)
+    return result
+
+
+# 重複しているファイルのグループのリストと、(読み込んだバイト数, 全体のバイト数) を返す
+def find_duplicates(roots, max_workers=None, min_size=1):
+    groups = group_by_size(roots)
+    sizes = {path: size for size, paths in groups.items() for path in paths}
+    total_bytes = sum(sizes.values())
+    candidates = [paths for size, paths in groups.items() if len(paths) >= 2 and size >= min_size]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        read_bytes = sum(min(sizes[path], 2 * PARTIAL_SIZE) for paths in candidates for path in paths)
+        candidates = split_groups(executor, partial_digest, candidates, sizes.__getitem__)
+
+        # 先頭と末尾でファイル全体を読んでいるものは、そのまま重複と分かる
+        small = [paths for paths in candidates if sizes[paths[0]] <= 2 * PARTIAL_SIZE]
+        large = [paths for paths in candidates if sizes[paths[0]] > 2 * PARTIAL_SIZE]
+        read_bytes += sum(sizes[path] for paths in large for path in paths)
+        large = split_groups(executor, full_digest, large)
+    return small + large, (read_bytes, total_bytes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find duplicate files by size, partial MD5 and full MD5.')
+    parser.add_argument('roots', nargs='+')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--min-size', type=int, default=1, help='ignore files smaller than this (bytes)')
+    parser.add_argument('--stats', action='store_true', help='print bytes read versus total to stderr')
+    args = parser.parse_args(argv)
+
+    duplicates, (read_bytes, total_bytes) = find_duplicates(args.roots, args.jobs, args.min_size)
+    for paths in duplicates:
+        print('\n'.join(paths))
+        print()
+    if args.stats:
+        print('{0} duplicate groups, read {1} of {2} bytes'.format(len(duplicates), read_bytes, total_bytes),
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
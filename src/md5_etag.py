@@ -0,0 +1,69 @@
+"""
+S3などのオブジェクトストレージで、マルチパートアップロードしたオブジェクトのETagを計算する
+
+ETagは、各パートのMD5（16bytes）を順につなげたもののMD5に、"-パート数" を付けたもの。
+各パートのMD5はプロセスプールで並列に計算する。
+
+使い方：
+  python md5_etag.py FILE [--part-size MB] [-j JOBS]
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from md5_with_int import MD5, md5_file
+
+
+# aws cliの既定値（multipart_threshold, multipart_chunksize）と同じ8MiB
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+# ファイルのoffsetからlengthバイトのMD5（16bytes）を計算する
+def md5_part(path, offset, length, chunk_size=1024 * 1024):
+    md5 = MD5()
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                break
+            md5.update(chunk)
+            length -= len(chunk)
+    return md5.digest()
+
+
+# 各パートのMD5をつなげてETagにする
+def combine_part_digests(part_digests):
+    return '{0}-{1}'.format(MD5(b''.join(part_digests)).hexdigest(), len(part_digests))
+
+
+# ファイルのETagを計算する
+# multipart_threshold未満のファイルは1回のPUTでアップロードされるので、ETagはファイル全体のMD5になる
+def multipart_etag(path, part_size=DEFAULT_PART_SIZE, multipart_threshold=None, max_workers=None):
+    if multipart_threshold is None:
+        multipart_threshold = part_size
+    size = os.path.getsize(path)
+    if size < multipart_threshold:
+        return md5_file(path).hexdigest()
+
+    offsets = range(0, size, part_size)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        part_digests = list(executor.map(
+            md5_part, [path] * len(offsets), offsets, [part_size] * len(offsets)))
+    return combine_part_digests(part_digests)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compute the multipart upload ETag of a file.')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--part-size', type=int, default=DEFAULT_PART_SIZE // (1024 * 1024), help='part size in MiB')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes')
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        print('{0}  {1}'.format(multipart_etag(path, args.part_size * 1024 * 1024, max_workers=args.jobs), path))
+
+
+if __name__ == '__main__':
+    main()
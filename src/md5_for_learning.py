@@ -132,8 +132,10 @@ def reverse_bits(bits):
 # ステップ2. メッセージに長さ付加
 
 # ステップ3. バッファの初期化
+# （初期値はmd5_core.INITIAL_STATEにある）
 
 # 計算用数値配列の準備
+# （テーブルTと各ステップのk, s, iはmd5_core.T, md5_core.SCHEDULEにある）
 
 # 
 
@@ -151,53 +153,54 @@ def md5_hexdigest(string):
 # テスト
 ##############################################################    
 
-import hashlib
-
-print("## '' ")
-print(md5_hexdigest(""))
-print(hashlib.md5("".encode('utf8')).hexdigest())
-print("")
-
-print("## 'a' ")
-print(md5_hexdigest("a"))
-print(hashlib.md5("a".encode('utf8')).hexdigest())
-print("")
-
-print("## 'abc' ")
-print(md5_hexdigest("abc"))
-print(hashlib.md5("abc".encode('utf8')).hexdigest())
-print("")
-
-print("## 'message digest' ")
-print(md5_hexdigest("message digest"))
-print(hashlib.md5("message digest".encode('utf8')).hexdigest())
-print("")
-
-print("## 'abcdefghijklmnopqrstuvwxyz' ")
-print(md5_hexdigest("abcdefghijklmnopqrstuvwxyz"))
-print(hashlib.md5("abcdefghijklmnopqrstuvwxyz".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123' ")
-print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123"))
-print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789' ")
-print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"))
-print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789".encode('utf8')).hexdigest())
-print("")
-
-print("## '12345678901234567890123456789012345678901234567890123456789012345678901234567890' ")
-print(md5_hexdigest("12345678901234567890123456789012345678901234567890123456789012345678901234567890"))
-print(hashlib.md5("12345678901234567890123456789012345678901234567890123456789012345678901234567890".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789' ")
-print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"))
-print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789".encode('utf8')).hexdigest())
-print("")
-
-print("## 'ああああああああああああああああああああああああ' ")
-print(md5_hexdigest("ああああああああああああああああああああああああ"))
-print(hashlib.md5("ああああああああああああああああああああああああ".encode('utf8')).hexdigest())
+if __name__ == '__main__':
+    import hashlib
+
+    print("## '' ")
+    print(md5_hexdigest(""))
+    print(hashlib.md5("".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'a' ")
+    print(md5_hexdigest("a"))
+    print(hashlib.md5("a".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'abc' ")
+    print(md5_hexdigest("abc"))
+    print(hashlib.md5("abc".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'message digest' ")
+    print(md5_hexdigest("message digest"))
+    print(hashlib.md5("message digest".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'abcdefghijklmnopqrstuvwxyz' ")
+    print(md5_hexdigest("abcdefghijklmnopqrstuvwxyz"))
+    print(hashlib.md5("abcdefghijklmnopqrstuvwxyz".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123' ")
+    print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123"))
+    print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789' ")
+    print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"))
+    print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789".encode('utf8')).hexdigest())
+    print("")
+
+    print("## '12345678901234567890123456789012345678901234567890123456789012345678901234567890' ")
+    print(md5_hexdigest("12345678901234567890123456789012345678901234567890123456789012345678901234567890"))
+    print(hashlib.md5("12345678901234567890123456789012345678901234567890123456789012345678901234567890".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789' ")
+    print(md5_hexdigest("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"))
+    print(hashlib.md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789".encode('utf8')).hexdigest())
+    print("")
+
+    print("## 'ああああああああああああああああああああああああ' ")
+    print(md5_hexdigest("ああああああああああああああああああああああああ"))
+    print(hashlib.md5("ああああああああああああああああああああああああ".encode('utf8')).hexdigest())
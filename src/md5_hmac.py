@@ -0,0 +1,74 @@
+"""
+HMAC-MD5（RFC 2104）
+
+  HMAC(K, m) = MD5((K xor opad) || MD5((K xor ipad) || m))
+
+K xor ipad と K xor opad はちょうど1ブロック（64bytes）なので、それぞれを処理した後の
+途中状態を鍵ごとに一度だけ計算し、最近使った鍵のものをKEY_CACHE_SIZE個まで覚えておく。
+メッセージごとに計算するのは、メッセージ自身のブロックと、外側の最後の1ブロックだけになる。
+（覚えておく途中状態から鍵そのものは戻せないが、同じMACを計算できるので鍵と同じように扱うこと）
+
+  HMAC_MD5(key, msg).hexdigest()
+  hmac_md5(key, msg)                 # 16bytesのMAC
+  verify(key, msg, mac)              # 定数時間で比較する
+"""
+
+import hmac
+from functools import lru_cache
+
+from md5_with_int import MD5
+
+
+TRANS_5C = bytes(x ^ 0x5C for x in range(256))
+TRANS_36 = bytes(x ^ 0x36 for x in range(256))
+
+KEY_CACHE_SIZE = 64
+
+
+# 鍵から、(K xor ipad) と (K xor opad) を処理した後の途中状態を作る
+# 返したMD5オブジェクトは共有されるので、続きを計算するときはcopy()してからupdate()する。
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def key_states(key):
+    if len(key) > MD5.block_size:
+        key = MD5(key).digest()
+    key = key.ljust(MD5.block_size, b'\x00')
+    return MD5(key.translate(TRANS_36)), MD5(key.translate(TRANS_5C))
+
+
+# hmac.HMACと同じようにupdate()で少しずつメッセージを渡せるHMAC-MD5
+class HMAC_MD5:
+    name = 'hmac-md5'
+    digest_size = 16
+    block_size = 64
+
+    def __init__(self, key, msg=b''):
+        inner, self._outer = key_states(bytes(key))
+        self._inner = inner.copy()
+        if msg:
+            self.update(msg)
+
+    def update(self, msg):
+        self._inner.update(msg)
+
+    def digest(self):
+        outer = self._outer.copy()
+        outer.update(self._inner.digest())
+        return outer.digest()
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+    def copy(self):
+        other = HMAC_MD5.__new__(HMAC_MD5)
+        other._inner = self._inner.copy()
+        other._outer = self._outer
+        return other
+
+
+def hmac_md5(key, msg):
+    return HMAC_MD5(key, msg).digest()
+
+
+# 受け取ったMAC（16bytes）が正しいかを、比較にかかる時間から推測されないように調べる
+def verify(key, msg, mac):
+    return hmac.compare_digest(hmac_md5(key, msg), mac)
@@ -0,0 +1,221 @@
+"""
+単語リストから、MD5ダイジェスト -> 単語 を逆引きするためのインデックスを作る
+
+インデックスは、(ダイジェスト16bytes, 単語リスト中の位置8bytes) の固定長レコードを
+ダイジェスト順に並べたファイル。検索はmmapした上で二分探索するので、
+インデックス全体をメモリに読み込まない。
+
+作り方：
+  1. 単語リストを行の境目で区切った範囲に分け、各範囲をプロセスプールで
+     HASH_BATCH_SIZE個ずつハッシュしてソートし、一時ファイル（ラン）に書き出す
+     （ワーカーが持つのは、範囲の単語リストと、24bytesに詰めたレコードだけ）
+  2. ランを heapq.merge で併合して、1つのインデックスにする
+     ランがMAX_MERGE_RUNSより多ければ、先にMAX_MERGE_RUNS個ずつ併合しておく
+
+使い方：
+  python md5_index.py build WORDLIST INDEX [-j JOBS]
+  python md5_index.py lookup WORDLIST INDEX HEX_DIGEST...
+"""
+
+import argparse
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from struct import Struct
+
+from md5_records import hash_records
+
+
+INDEX_MAGIC = b'MD5IDX\x00\x01'
+# ダイジェスト（16bytes）と単語の位置（リトルエンディアン8bytes）
+RECORD = Struct('<16sQ')
+# 1つのワーカーが一度に受け持つ単語リストの大きさ
+# 短い単語ばかりだと、レコードは単語リストの大きさの10倍ほどのメモリを使う
+DEFAULT_RANGE_SIZE = 8 * 1024 * 1024
+# 一度にまとめてハッシュする単語の数
+HASH_BATCH_SIZE = 10000
+# 一度に併合するランの数（開くファイルの数と、読み込み用のバッファの合計を抑える）
+MAX_MERGE_RUNS = 256
+
+
+# 単語リストを、行の途中で切れないようにrange_sizeバイトくらいずつの範囲に分ける
+def split_ranges(wordlist_path, range_size=DEFAULT_RANGE_SIZE):
+    size = os.path.getsize(wordlist_path)
+    boundaries = [0]
+    with open(wordlist_path, 'rb') as f:
+        while boundaries[-1] + range_size < size:
+            f.seek(boundaries[-1] + range_size)
+            f.readline()
+            if f.tell() >= size:
+                break
+            boundaries.append(f.tell())
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+# dataの各行を (行, 単語リスト中の位置) として順に返す（startはdataの先頭の位置）
+def iter_lines(data, start):
+    pos = 0
+    while pos < len(data):
+        newline = data.find(b'\n', pos)
+        if newline < 0:
+            newline = len(data)
+        yield data[pos:newline].rstrip(b'\r'), start + pos
+        pos = newline + 1
+
+
+# 単語リストの [start, end) の各行をハッシュし、ダイジェスト順に並べてrun_pathに書き出す
+# レコードは詰めたbytesで持つ（先頭がダイジェストなので、bytesのままソートすればダイジェスト順になる）
+def build_run(wordlist_path, start, end, run_path, batch_size=HASH_BATCH_SIZE):
+    with open(wordlist_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    pack = RECORD.pack
+    records = [pack(digest, offset)
+               for (_, offset), digest in hash_records(iter_lines(data, start), batch_size, key=lambda line: line[0])]
+    del data
+    records.sort()
+    with open(run_path, 'wb') as f:
+        for i in range(0, len(records), 65536):
+            f.write(b''.join(records[i:i + 65536]))
+    return run_path
+
+
+# ランのファイルからレコードを順に読み出す
+def iter_run(run_path, buffer_size=64 * 1024):
+    with open(run_path, 'rb') as f:
+        while True:
+            data = f.read(buffer_size - buffer_size % RECORD.size)
+            if not data:
+                break
+            yield from RECORD.iter_unpack(data)
+
+
+# ランを併合してfに書き出し、レコードの数を返す
+def merge_runs(run_paths, f):
+    num_records = 0
+    buffer = []
+    for record in heapq.merge(*(iter_run(path) for path in run_paths)):
+        buffer.append(RECORD.pack(*record))
+        if len(buffer) >= 65536:
+            f.write(b''.join(buffer))
+            buffer = []
+        num_records += 1
+    f.write(b''.join(buffer))
+    return num_records
+
+
+def build_index(wordlist_path, index_path, max_workers=None, range_size=DEFAULT_RANGE_SIZE):
+    tmp_dir = tempfile.mkdtemp(prefix='md5_index_', dir=os.path.dirname(os.path.abspath(index_path)))
+    try:
+        ranges = split_ranges(wordlist_path, range_size)
+        run_paths = [os.path.join(tmp_dir, 'run{0:06d}'.format(n)) for n in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(build_run, [wordlist_path] * len(ranges),
+                              [start for start, _ in ranges], [end for _, end in ranges], run_paths))
+
+        # ランが多すぎれば、MAX_MERGE_RUNS個ずつ併合して減らす
+        level = 0
+        while len(run_paths) > MAX_MERGE_RUNS:
+            merged_paths = []
+            for n in range(0, len(run_paths), MAX_MERGE_RUNS):
+                merged_path = os.path.join(tmp_dir, 'merge{0}_{1:06d}'.format(level, n // MAX_MERGE_RUNS))
+                with open(merged_path, 'wb') as f:
+                    merge_runs(run_paths[n:n + MAX_MERGE_RUNS], f)
+                for path in run_paths[n:n + MAX_MERGE_RUNS]:
+                    os.remove(path)
+                merged_paths.append(merged_path)
+            run_paths = merged_paths
+            level += 1
+
+        with open(index_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            num_records = merge_runs(run_paths, f)
+        return num_records
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# mmapしたインデックスと単語リストから、ダイジェストに対応する単語を探す
+class DigestIndex:
+    def __init__(self, wordlist_path, index_path):
+        with open(index_path, 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # 空のファイルはmmapできないので、単語リストが空ならb''で代用する（インデックスも空になる）
+        with open(wordlist_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self._wordlist = b''
+            else:
+                self._wordlist = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._index[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError('not an MD5 digest index')
+        self._num_records = (len(self._index) - len(INDEX_MAGIC)) // RECORD.size
+
+    def __len__(self):
+        return self._num_records
+
+    def _digest_at(self, i):
+        pos = len(INDEX_MAGIC) + i * RECORD.size
+        return self._index[pos:pos + 16]
+
+    def _word_at(self, offset):
+        end = self._wordlist.find(b'\n', offset)
+        if end < 0:
+            end = len(self._wordlist)
+        return self._wordlist[offset:end].rstrip(b'\r')
+
+    # ダイジェスト（16bytes）に対応する単語を返す。見つからなければNone
+    def lookup(self, digest):
+        lo, hi = 0, self._num_records
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._digest_at(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._num_records and self._digest_at(lo) == digest:
+            _, offset = RECORD.unpack_from(self._index, len(INDEX_MAGIC) + lo * RECORD.size)
+            return self._word_at(offset)
+        return None
+
+    def close(self):
+        self._index.close()
+        if isinstance(self._wordlist, mmap.mmap):
+            self._wordlist.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query a sorted MD5 digest index of a wordlist.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build')
+    build_parser.add_argument('wordlist')
+    build_parser.add_argument('index')
+    build_parser.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes')
+    lookup_parser = subparsers.add_parser('lookup')
+    lookup_parser.add_argument('wordlist')
+    lookup_parser.add_argument('index')
+    lookup_parser.add_argument('digests', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        num_records = build_index(args.wordlist, args.index, args.jobs)
+        print('{0} entries'.format(num_records))
+    else:
+        with DigestIndex(args.wordlist, args.index) as index:
+            for hex_digest in args.digests:
+                word = index.lookup(bytes.fromhex(hex_digest))
+                print('{0}  {1}'.format(hex_digest, '' if word is None else word.decode('utf-8', 'replace')))
+
+
+if __name__ == '__main__':
+    main()
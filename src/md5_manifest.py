@@ -0,0 +1,115 @@
+"""
+ファイルのMD5をSQLiteに覚えておき、変更されていないファイルは計算し直さないキャッシュ
+
+(デバイス, inode, 大きさ, 更新時刻ns) が前回と同じファイルは、保存したダイジェストを使う。
+WALモードで開き、書き込みが重なったときはtimeout秒まで待つので、
+複数のプロセスから同じデータベースを使ってよい。
+
+  cache = ManifestCache('md5cache.sqlite3')
+  cache.hexdigest(path)
+  cache.bytes_hashed, cache.bytes_skipped
+
+使い方：
+  python md5_manifest.py prune DB      # 削除・置き換えられたファイルの行を消す
+"""
+
+import argparse
+import os
+import sqlite3
+
+from md5_with_int import md5_file
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS digests (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    path BLOB NOT NULL,
+    md5 TEXT NOT NULL,
+    PRIMARY KEY (device, inode)
+)
+'''
+
+
+class ManifestCache:
+    def __init__(self, db_path, timeout=30.0):
+        self._conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(SCHEMA)
+        self.bytes_hashed = 0
+        self.bytes_skipped = 0
+
+    # statの結果が前回と同じなら、保存したダイジェストを返す
+    def lookup(self, st):
+        row = self._conn.execute(
+            'SELECT md5 FROM digests WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?',
+            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)).fetchone()
+        return None if row is None else row[0]
+
+    # 計算を始める前のstatの結果stと、計算後のファイルが変わっていなければ保存する
+    # パスはUTF-8で表せないファイル名もあるので、os.fsencodeしたbytesで保存する
+    def store(self, path, st, hex_hash):
+        try:
+            now = os.stat(path)
+        except OSError:
+            return
+        if (now.st_dev, now.st_ino, now.st_size, now.st_mtime_ns) != (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns):
+            return
+        self._conn.execute(
+            'INSERT OR REPLACE INTO digests (device, inode, size, mtime_ns, path, md5) VALUES (?, ?, ?, ?, ?, ?)',
+            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, os.fsencode(os.path.abspath(path)), hex_hash))
+
+    # ファイルのMD5を返す（変更されていなければ計算しない）
+    def hexdigest(self, path):
+        st = os.stat(path)
+        hex_hash = self.lookup(st)
+        if hex_hash is not None:
+            self.bytes_skipped += st.st_size
+            return hex_hash
+        hex_hash = md5_file(path).hexdigest()
+        self.bytes_hashed += st.st_size
+        self.store(path, st, hex_hash)
+        return hex_hash
+
+    # 保存したパスのファイルがなくなったか、別のファイルに置き換わった行を消し、消した数を返す
+    def prune(self):
+        stale = []
+        for device, inode, path in self._conn.execute('SELECT device, inode, path FROM digests'):
+            try:
+                st = os.stat(os.fsdecode(path))
+            except OSError:
+                stale.append((device, inode, path))
+                continue
+            if (st.st_dev, st.st_ino) != (device, inode):
+                stale.append((device, inode, path))
+        # 調べている間に他のプロセスが別のパスで保存し直した行は消さない
+        with self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            cursor = self._conn.executemany('DELETE FROM digests WHERE device = ? AND inode = ? AND path = ?', stale)
+        return cursor.rowcount if stale else 0
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Maintain the SQLite MD5 digest cache.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    prune_parser = subparsers.add_parser('prune', help='remove entries for deleted or replaced files')
+    prune_parser.add_argument('db')
+    args = parser.parse_args(argv)
+
+    with ManifestCache(args.db) as cache:
+        print('{0} entries removed'.format(cache.prune()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+from struct import pack
+
+import numpy as np
+
+from md5_core import INITIAL_STATE, SCHEDULE, T
+from md5_with_int import F, G, H, I, add_padding
+
+
+##############################################################
+# NumPyで複数のメッセージをまとめて計算する
+# 1つのメッセージを配列の1要素（レーン）に割り当て、
+# md5_with_intの補助関数F, G, H, Iをuint32の配列に対してそのまま適用する。
+##############################################################
+
+# 各段階の補助関数
+AUXILIARY_FUNCTIONS = (F, G, H, I)
+
+# 64ステップ分の (補助関数, k, s, T[i])
+STEPS = tuple((AUXILIARY_FUNCTIONS[(i - 1) // 16], k, s, T[i]) for k, s, i in SCHEDULE)
+
+
+# uint32の配列の左ローテート（uint32同士の演算は32bitsで自然に切り捨てられる）
+def L_ROTATE(n, num_bits):
+    return (n << num_bits) | (n >> (32 - num_bits))
+
+
+# ステップ1, 2. メッセージの拡張と長さ付加をまとめて行う
+def pad_message(input_bytes):
+    return add_padding(input_bytes) + pack('<Q', (len(input_bytes) * 8) & 0xFFFFFFFFFFFFFFFF)
+
+
+# ステップ4. 算出処理のループ1回分の処理（Xは16 x レーン数のuint32配列）
+def calculate_MD5_batch(X, A, B, C, D):
+    AA, BB, CC, DD = A, B, C, D
+
+    for aux, k, s, t in STEPS:
+        A = B + L_ROTATE(A + aux(B, C, D) + X[k] + np.uint32(t), s)
+        # 次のステップでは a, b, c, d の役割が右へずれる
+        A, B, C, D = D, A, B, C
+
+    return A + AA, B + BB, C + CC, D + DD
+
+
+# パディング後のブロック数が同じメッセージをまとめて計算する
+def md5_same_blocks(messages):
+    num_lanes = len(messages)
+    padded = b''.join(pad_message(m) for m in messages)
+    # (ブロック数, 16words, レーン数) に並べ替え、1ステップで使うX[k]を連続させる
+    words = np.frombuffer(padded, dtype='<u4').reshape(num_lanes, -1, 16).transpose(1, 2, 0).copy()
+
+    # ステップ3. バッファの初期化
+    A, B, C, D = (np.full(num_lanes, word, dtype=np.uint32) for word in INITIAL_STATE)
+
+    # ステップ4. 算出処理
+    for X in words:
+        A, B, C, D = calculate_MD5_batch(X, A, B, C, D)
+
+    # ステップ5. 出力（リトルエンディアンで16bytesに並べる）
+    return np.stack([A, B, C, D], axis=1).astype('<u4').view(np.uint8)
+
+
+# 複数のメッセージのMD5を計算し、(メッセージ数, 16) のuint8配列で返す
+def md5_batch(list_of_bytes):
+    digests = np.empty((len(list_of_bytes), 16), dtype=np.uint8)
+
+    # 全レーンが同じ手順で進むように、パディング後のブロック数ごとに分ける
+    groups = {}
+    for index, message in enumerate(list_of_bytes):
+        num_blocks = (len(message) + 8) // 64 + 1
+        groups.setdefault(num_blocks, []).append(index)
+
+    for indices in groups.values():
+        digests[indices] = md5_same_blocks([list_of_bytes[i] for i in indices])
+    return digests
+
+
+##############################################################
+# 実行例（テストはtest_md5.py）
+##############################################################
+
+if __name__ == '__main__':
+    import time
+
+    keys = [b'key:%d' % n for n in range(100000)]
+    start = time.perf_counter()
+    digests = md5_batch(keys)
+    elapsed = time.perf_counter() - start
+    print('{0} keys: {1:.3f} s ({2:.0f} keys/s)'.format(len(keys), elapsed, len(keys) / elapsed))
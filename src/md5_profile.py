@@ -0,0 +1,147 @@
+"""
+MD5の計算の各段階にかかった時間を測る
+
+with profile(md5_with_int) as stats: の中だけ、各段階の関数を計測用の関数に差し替える。
+withの外では元の関数のままなので、計測しないときの負担はない。
+（モジュールの関数を差し替えるので、計測中は他のスレッドの計算も数えられる）
+
+使い方：
+    import md5_with_int
+    from md5_profile import profile
+
+    with profile(md5_with_int) as stats:
+        md5_with_int.md5_hexdigest(data)
+    print(stats.report())
+"""
+
+import time
+from contextlib import contextmanager
+from functools import partial
+
+
+# 各段階で差し替える関数と、その呼び出しで処理するbytes数・ブロック数の数え方
+def count_bytes(data):
+    return len(data), 0
+
+
+def count_bits(bits):
+    return len(bits) // 8, 0
+
+
+def count_block(*args):
+    return 64, 1
+
+
+def count_nothing(*args):
+    return 0, 0
+
+
+STAGES = {
+    'md5_with_int': [
+        ('padding', 'add_padding', count_bytes),
+        ('words', 'bytes_to_words', count_bytes),
+        ('block', 'calculate_MD5', count_block),
+        ('block', 'calculate_MD5_fast', count_block),
+        ('finalize', 'finalize', count_nothing),
+    ],
+    'md5': [
+        ('padding', 'padding_to_bits', count_bits),
+        ('bits', 'bytes_to_bits', count_bytes),
+        ('words', 'get_array_X', count_bits),
+        ('block', 'culuculate_MD5', lambda bits, buffer: (len(bits) // 8, 1)),
+        ('finalize', 'finalize', count_nothing),
+    ],
+}
+
+
+# 1つの段階の累計
+class StageStats:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.blocks = 0
+
+    def as_dict(self):
+        return dict(calls=self.calls, seconds=self.seconds, bytes=self.bytes, blocks=self.blocks)
+
+
+class ProfileStats:
+    def __init__(self):
+        self.stages = {}
+
+    def stage(self, name):
+        if name not in self.stages:
+            self.stages[name] = StageStats()
+        return self.stages[name]
+
+    def as_dict(self):
+        return {name: stage.as_dict() for name, stage in self.stages.items()}
+
+    def report(self):
+        lines = ['{0:<24} {1:>10} {2:>12} {3:>14} {4:>10}'.format('stage', 'calls', 'seconds', 'bytes', 'blocks')]
+        for name, stage in self.stages.items():
+            lines.append('{0:<24} {1:>10} {2:>12.6f} {3:>14} {4:>10}'.format(
+                name, stage.calls, stage.seconds, stage.bytes, stage.blocks))
+        return '\n'.join(lines)
+
+
+def instrument(func, stage, count):
+    def wrapper(*args):
+        start = time.perf_counter()
+        result = func(*args)
+        stage.seconds += time.perf_counter() - start
+        stage.calls += 1
+        num_bytes, num_blocks = count(*args)
+        stage.bytes += num_bytes
+        stage.blocks += num_blocks
+        return result
+    return wrapper
+
+
+# withの間だけ、modulesの関数を差し替え、抜けたら元に戻す（md5_trace.traceでも使う）
+# replacements_for(モジュール名) は [(関数名, 元の関数から差し替える関数を作る関数), ...] を返す
+@contextmanager
+def replace_functions(modules, replacements_for):
+    originals = []
+    try:
+        for module in modules:
+            module_name = module.__name__.rpartition('.')[2]
+            for func_name, replace in replacements_for(module_name):
+                func = getattr(module, func_name)
+                originals.append((module, func_name, func))
+                setattr(module, func_name, replace(func))
+        yield
+    finally:
+        for module, func_name, func in reversed(originals):
+            setattr(module, func_name, func)
+
+
+# withの間だけ、modulesの各段階の関数を計測用に差し替える
+@contextmanager
+def profile(*modules):
+    stats = ProfileStats()
+
+    def replacements_for(module_name):
+        return [(func_name, partial(instrument, stage=stats.stage('{0}.{1}'.format(module_name, stage_name)),
+                                    count=count))
+                for stage_name, func_name, count in STAGES[module_name]]
+
+    with replace_functions(modules, replacements_for):
+        yield stats
+
+
+##############################################################
+# 実行例（テストはtest_md5.py）
+##############################################################
+
+if __name__ == '__main__':
+    import md5
+    import md5_with_int
+
+    data = bytes(range(256)) * 64
+    with profile(md5_with_int, md5) as stats:
+        md5_with_int.md5_hexdigest(data)
+        md5_with_int.MD5(data).hexdigest()
+        md5.md5_hexdigest(data)
+    print(stats.report())
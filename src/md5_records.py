@@ -0,0 +1,108 @@
+"""
+行やCSVの列ごとにMD5を計算する
+
+ファイルは大きなチャンク単位で読み、レコードをbatch_size個ずつまとめて計算する。
+NumPyがあればmd5_numpy.md5_batchでまとめて計算し、なければmd5_with_int.MD5で1つずつ計算する。
+メモリ上にあるのは、読み込み中のチャンクと1バッチ分のレコードだけ。
+
+使い方：
+  python md5_records.py FILE                      # 行ごとに "ダイジェスト<TAB>行" を出力する
+  python md5_records.py FILE --column email       # CSVのemail列のMD5を、最後の列に追加して出力する
+  python md5_records.py FILE --column 2 --no-header --stats
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+from md5_with_int import MD5
+
+
+# 改行などで区切られたレコードを、チャンク単位で読みながら順に返す（区切り文字は含まない）
+# 区切り文字を探すのは新しく読んだ部分（とチャンクの境目にまたがる分）だけなので、
+# chunk_sizeより長いレコードがあっても、読んだ量に比例する時間で済む
+def iter_records(f, chunk_size=1024 * 1024, delimiter=b'\n'):
+    buffer = bytearray()
+    for chunk in iter(lambda: f.read(chunk_size), b''):
+        start = max(len(buffer) - len(delimiter) + 1, 0)
+        buffer += chunk
+        end = buffer.rfind(delimiter, start)
+        if end < 0:
+            continue
+        yield from bytes(buffer[:end]).split(delimiter)
+        del buffer[:end + len(delimiter)]
+    if buffer:
+        yield bytes(buffer)
+
+
+# csv.readerの行を (行, 指定した列の値をencodeしたbytes) として順に返す
+# 空行は飛ばし、列が足りない行は、その列を空文字列として扱う
+def iter_csv_column(rows, column, encoding='utf-8'):
+    for row in rows:
+        if not row:
+            continue
+        yield row, row[column].encode(encoding) if column < len(row) else b''
+
+
+# レコードのリストのMD5（16bytes）のリストを返す
+def digest_batch(records):
+    try:
+        from md5_numpy import md5_batch
+    except ImportError:
+        return [MD5(record).digest() for record in records]
+    return [row.tobytes() for row in md5_batch(records)]
+
+
+# itemsからkey(item)のMD5を計算し、(item, ダイジェスト) を順に返す
+def hash_records(items, batch_size=10000, key=None):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield from zip(batch, digest_batch(batch if key is None else [key(i) for i in batch]))
+            batch = []
+    if batch:
+        yield from zip(batch, digest_batch(batch if key is None else [key(i) for i in batch]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Hash every line or CSV field of a file with MD5.')
+    parser.add_argument('file')
+    parser.add_argument('--column', default=None, help='CSV column name (or index with --no-header) to hash')
+    parser.add_argument('--no-header', action='store_true', help='the CSV file has no header row')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--stats', action='store_true', help='print records/s to stderr')
+    args = parser.parse_args(argv)
+
+    num_records = 0
+    start = time.perf_counter()
+    out = sys.stdout
+    if args.column is None:
+        with open(args.file, 'rb') as f:
+            for record, digest in hash_records(iter_records(f), args.batch_size):
+                out.write('{0}\t{1}\n'.format(digest.hex(), record.decode('utf-8', 'surrogateescape')))
+                num_records += 1
+    else:
+        with open(args.file, newline='', encoding='utf-8', buffering=1024 * 1024) as f:
+            reader = csv.reader(f)
+            writer = csv.writer(out)
+            if args.no_header:
+                column = int(args.column)
+            else:
+                header = next(reader)
+                column = header.index(args.column)
+                writer.writerow(header + [args.column + '_md5'])
+            pairs = hash_records(iter_csv_column(reader, column), args.batch_size, key=lambda pair: pair[1])
+            for (row, _), digest in pairs:
+                writer.writerow(row + [digest.hex()])
+                num_records += 1
+    elapsed = time.perf_counter() - start
+
+    if args.stats:
+        print('{0} records in {1:.3f} s ({2:.0f} records/s)'.format(
+            num_records, elapsed, num_records / elapsed if elapsed else 0.0), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
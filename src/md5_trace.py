@@ -0,0 +1,98 @@
+"""
+MD5の各ステップの後のバッファA, B, C, Dを記録する
+
+with trace(md5_with_int) as tracer: の中だけ、64ステップの処理を記録用の関数に差し替える。
+（md5_profile.profileと同じく、withの外では元の関数のままなので、記録しないときの負担はない）
+  md5_with_int: calculate_MD5, calculate_MD5_fast を、記録する展開版 calculate_MD5_traced に
+  md5:          FF, GG, HH, II を、結果を記録してから返す関数に
+
+記録は (ブロック番号, ステップ番号1〜64, A, B, C, D) の6つの値で、あらかじめ確保した
+array('I') に輪状に書き込み、最新のdepthステップ分だけを残す。
+ブロック番号は、traceを始めてから何番目に処理したブロックか（0始まり）。
+
+使い方：
+    import md5_with_int
+    from md5_trace import trace
+
+    with trace(md5_with_int, depth=256) as tracer:
+        md5_with_int.md5_hexdigest(data)
+    for block, step, A, B, C, D in tracer.export():
+        print(block, step, '{0:08x} {1:08x} {2:08x} {3:08x}'.format(A, B, C, D))
+"""
+
+from array import array
+from contextlib import contextmanager
+from functools import partial
+
+from md5_profile import replace_functions
+from md5_unrolled import calculate_MD5_traced
+
+
+# 1ステップ分の記録の大きさ（ブロック番号, ステップ番号, A, B, C, D）
+RECORD_SIZE = 6
+
+
+class Tracer:
+    def __init__(self, depth=1024):
+        self.depth = depth
+        self.buffer = array('I', bytes(4 * RECORD_SIZE * depth))
+        # traceを始めてから記録したステップの数
+        self.count = 0
+
+    # 1ステップ分を記録する（1ブロックは必ず64ステップなので、ブロック番号とステップ番号はcountから分かる）
+    def record(self, A, B, C, D):
+        count = self.count
+        buffer = self.buffer
+        pos = count % self.depth * RECORD_SIZE
+        buffer[pos] = (count >> 6) & 0xFFFFFFFF
+        buffer[pos + 1] = (count & 63) + 1
+        buffer[pos + 2] = A
+        buffer[pos + 3] = B
+        buffer[pos + 4] = C
+        buffer[pos + 5] = D
+        self.count = count + 1
+
+    # 残っている記録を、古いものから (ブロック番号, ステップ番号, A, B, C, D) のリストで返す
+    def export(self):
+        num_records = min(self.count, self.depth)
+        start = (self.count - num_records) % self.depth
+        buffer = self.buffer
+        return [tuple(buffer[pos * RECORD_SIZE:(pos + 1) * RECORD_SIZE])
+                for pos in ((start + n) % self.depth for n in range(num_records))]
+
+
+# md5_with_int: 元の関数は使わず、64ステップを展開して各ステップの後にrecordを呼ぶ版に置き換える
+def trace_block(tracer):
+    record = tracer.record
+
+    def calculate_MD5_with_trace(X, A, B, C, D):
+        return calculate_MD5_traced(X, A, B, C, D, record)
+    return calculate_MD5_with_trace
+
+
+# md5: FF(a, b, c, d, ...) などの結果は、そのステップで書き換わるバッファの新しい値
+# ステップごとに a, b, c, d の役割が右へずれるので、何番目のステップかからA, B, C, Dに戻す
+def trace_step(tracer, func):
+    record = tracer.record
+
+    def step_with_trace(a, b, c, d, x, s, ac):
+        result = func(a, b, c, d, x, s, ac)
+        values = (int(result, 2), int(b, 2), int(c, 2), int(d, 2))
+        shift = -tracer.count % 4
+        record(*(values[(n - shift) % 4] for n in range(4)))
+        return result
+    return step_with_trace
+
+
+# withの間だけ、modulesの64ステップの処理を記録用に差し替える
+@contextmanager
+def trace(*modules, depth=1024):
+    tracer = Tracer(depth)
+    calculate_MD5_with_trace = trace_block(tracer)
+    replacements = {
+        'md5_with_int': [(func_name, lambda func: calculate_MD5_with_trace)
+                         for func_name in ('calculate_MD5', 'calculate_MD5_fast')],
+        'md5': [(func_name, partial(trace_step, tracer)) for func_name in ('FF', 'GG', 'HH', 'II')],
+    }
+    with replace_functions(modules, replacements.__getitem__):
+        yield tracer
@@ -0,0 +1,334 @@
+# このファイルは gen_md5_unrolled.py で生成したもの。直接編集しないこと。
+# ステップ4. 算出処理のループ1回分の処理（md5_with_int.calculate_MD5 を展開した高速版）
+
+
+def calculate_MD5_fast(X, A, B, C, D):
+    x0, x1, x2, x3, x4, x5, x6, x7, x8, x9, x10, x11, x12, x13, x14, x15 = X
+    a, b, c, d = A, B, C, D
+    t = (a + (d ^ (b & (c ^ d))) + x0 + 0xD76AA478) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x1 + 0xE8C7B756) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x2 + 0x242070DB) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x3 + 0xC1BDCEEE) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x4 + 0xF57C0FAF) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x5 + 0x4787C62A) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x6 + 0xA8304613) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x7 + 0xFD469501) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x8 + 0x698098D8) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x9 + 0x8B44F7AF) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x10 + 0xFFFF5BB1) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x11 + 0x895CD7BE) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x12 + 0x6B901122) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x13 + 0xFD987193) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x14 + 0xA679438E) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x15 + 0x49B40821) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x1 + 0xF61E2562) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x6 + 0xC040B340) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x11 + 0x265E5A51) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x0 + 0xE9B6C7AA) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x5 + 0xD62F105D) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x10 + 0x02441453) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x15 + 0xD8A1E681) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x4 + 0xE7D3FBC8) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x9 + 0x21E1CDE6) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x14 + 0xC33707D6) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x3 + 0xF4D50D87) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x8 + 0x455A14ED) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x13 + 0xA9E3E905) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x2 + 0xFCEFA3F8) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x7 + 0x676F02D9) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x12 + 0x8D2A4C8A) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x5 + 0xFFFA3942) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x8 + 0x8771F681) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x11 + 0x6D9D6122) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x14 + 0xFDE5380C) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x1 + 0xA4BEEA44) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x4 + 0x4BDECFA9) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x7 + 0xF6BB4B60) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x10 + 0xBEBFBC70) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x13 + 0x289B7EC6) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x0 + 0xEAA127FA) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x3 + 0xD4EF3085) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x6 + 0x04881D05) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x9 + 0xD9D4D039) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x12 + 0xE6DB99E5) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x15 + 0x1FA27CF8) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x2 + 0xC4AC5665) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x0 + 0xF4292244) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x7 + 0x432AFF97) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x14 + 0xAB9423A7) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x5 + 0xFC93A039) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x12 + 0x655B59C3) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x3 + 0x8F0CCC92) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x10 + 0xFFEFF47D) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x1 + 0x85845DD1) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x8 + 0x6FA87E4F) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x15 + 0xFE2CE6E0) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x6 + 0xA3014314) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x13 + 0x4E0811A1) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x4 + 0xF7537E82) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x11 + 0xBD3AF235) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x2 + 0x2AD7D2BB) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x9 + 0xEB86D391) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    return ((A + a) & 0xFFFFFFFF, (B + b) & 0xFFFFFFFF, (C + c) & 0xFFFFFFFF, (D + d) & 0xFFFFFFFF)
+
+
+def calculate_MD5_traced(X, A, B, C, D, record):
+    x0, x1, x2, x3, x4, x5, x6, x7, x8, x9, x10, x11, x12, x13, x14, x15 = X
+    a, b, c, d = A, B, C, D
+    t = (a + (d ^ (b & (c ^ d))) + x0 + 0xD76AA478) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (c ^ (a & (b ^ c))) + x1 + 0xE8C7B756) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (b ^ (d & (a ^ b))) + x2 + 0x242070DB) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (a ^ (c & (d ^ a))) + x3 + 0xC1BDCEEE) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (d ^ (b & (c ^ d))) + x4 + 0xF57C0FAF) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (c ^ (a & (b ^ c))) + x5 + 0x4787C62A) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (b ^ (d & (a ^ b))) + x6 + 0xA8304613) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (a ^ (c & (d ^ a))) + x7 + 0xFD469501) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (d ^ (b & (c ^ d))) + x8 + 0x698098D8) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (c ^ (a & (b ^ c))) + x9 + 0x8B44F7AF) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (b ^ (d & (a ^ b))) + x10 + 0xFFFF5BB1) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (a ^ (c & (d ^ a))) + x11 + 0x895CD7BE) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (d ^ (b & (c ^ d))) + x12 + 0x6B901122) & 0xFFFFFFFF
+    a = (b + ((t << 7 | t >> 25) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (c ^ (a & (b ^ c))) + x13 + 0xFD987193) & 0xFFFFFFFF
+    d = (a + ((t << 12 | t >> 20) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (b ^ (d & (a ^ b))) + x14 + 0xA679438E) & 0xFFFFFFFF
+    c = (d + ((t << 17 | t >> 15) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (a ^ (c & (d ^ a))) + x15 + 0x49B40821) & 0xFFFFFFFF
+    b = (c + ((t << 22 | t >> 10) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (d & (b ^ c))) + x1 + 0xF61E2562) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (c & (a ^ b))) + x6 + 0xC040B340) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (b & (d ^ a))) + x11 + 0x265E5A51) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (a & (c ^ d))) + x0 + 0xE9B6C7AA) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (d & (b ^ c))) + x5 + 0xD62F105D) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (c & (a ^ b))) + x10 + 0x02441453) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (b & (d ^ a))) + x15 + 0xD8A1E681) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (a & (c ^ d))) + x4 + 0xE7D3FBC8) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (d & (b ^ c))) + x9 + 0x21E1CDE6) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (c & (a ^ b))) + x14 + 0xC33707D6) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (b & (d ^ a))) + x3 + 0xF4D50D87) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (a & (c ^ d))) + x8 + 0x455A14ED) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (d & (b ^ c))) + x13 + 0xA9E3E905) & 0xFFFFFFFF
+    a = (b + ((t << 5 | t >> 27) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (c & (a ^ b))) + x2 + 0xFCEFA3F8) & 0xFFFFFFFF
+    d = (a + ((t << 9 | t >> 23) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (b & (d ^ a))) + x7 + 0x676F02D9) & 0xFFFFFFFF
+    c = (d + ((t << 14 | t >> 18) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (a & (c ^ d))) + x12 + 0x8D2A4C8A) & 0xFFFFFFFF
+    b = (c + ((t << 20 | t >> 12) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (b ^ c ^ d) + x5 + 0xFFFA3942) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (a ^ b ^ c) + x8 + 0x8771F681) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (d ^ a ^ b) + x11 + 0x6D9D6122) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (c ^ d ^ a) + x14 + 0xFDE5380C) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (b ^ c ^ d) + x1 + 0xA4BEEA44) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (a ^ b ^ c) + x4 + 0x4BDECFA9) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (d ^ a ^ b) + x7 + 0xF6BB4B60) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (c ^ d ^ a) + x10 + 0xBEBFBC70) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (b ^ c ^ d) + x13 + 0x289B7EC6) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (a ^ b ^ c) + x0 + 0xEAA127FA) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (d ^ a ^ b) + x3 + 0xD4EF3085) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (c ^ d ^ a) + x6 + 0x04881D05) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (b ^ c ^ d) + x9 + 0xD9D4D039) & 0xFFFFFFFF
+    a = (b + ((t << 4 | t >> 28) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (a ^ b ^ c) + x12 + 0xE6DB99E5) & 0xFFFFFFFF
+    d = (a + ((t << 11 | t >> 21) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (d ^ a ^ b) + x15 + 0x1FA27CF8) & 0xFFFFFFFF
+    c = (d + ((t << 16 | t >> 16) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (c ^ d ^ a) + x2 + 0xC4AC5665) & 0xFFFFFFFF
+    b = (c + ((t << 23 | t >> 9) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x0 + 0xF4292244) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x7 + 0x432AFF97) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x14 + 0xAB9423A7) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x5 + 0xFC93A039) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x12 + 0x655B59C3) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x3 + 0x8F0CCC92) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x10 + 0xFFEFF47D) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x1 + 0x85845DD1) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x8 + 0x6FA87E4F) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x15 + 0xFE2CE6E0) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x6 + 0xA3014314) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x13 + 0x4E0811A1) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x4 + 0xF7537E82) & 0xFFFFFFFF
+    a = (b + ((t << 6 | t >> 26) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x11 + 0xBD3AF235) & 0xFFFFFFFF
+    d = (a + ((t << 10 | t >> 22) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x2 + 0x2AD7D2BB) & 0xFFFFFFFF
+    c = (d + ((t << 15 | t >> 17) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x9 + 0xEB86D391) & 0xFFFFFFFF
+    b = (c + ((t << 21 | t >> 11) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    record(a, b, c, d)
+    return ((A + a) & 0xFFFFFFFF, (B + b) & 0xFFFFFFFF, (C + c) & 0xFFFFFFFF, (D + d) & 0xFFFFFFFF)
@@ -1,6 +1,10 @@
-from functools import reduce
-from math import sin
-from struct import iter_unpack, pack
+import mmap
+from functools import lru_cache, reduce
+from struct import iter_unpack, pack, unpack_from
+
+from md5_core import INITIAL_STATE, T
+# calculate_MD5を展開した高速版（gen_md5_unrolled.pyで生成する）
+from md5_unrolled import calculate_MD5_fast
 
 
 # bytesをwords（32bits以内のintのlist）に変換
@@ -57,12 +61,6 @@ def I(X, Y, Z):
     return Y ^ (X | NOT(Z))
 
 
-# テーブルT
-T = {}
-for i in range(1, 64 + 1):
-    T[i] = WORD(int(4294967296 * abs(sin(i))))
-
-
 # ステップ1. メッセージの拡張
 def add_padding(input_bytes):
     num_bits = len(input_bytes) * 8
@@ -208,7 +206,7 @@ def md5_hexdigest(input_bytes):
     assert len(padded_words_with_length) % 16 == 0
 
     # ステップ3. バッファの初期化
-    A, B, C, D = 0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476
+    A, B, C, D = INITIAL_STATE
 
     # ステップ4. 算出処理
     for i in range(0, len(padded_words_with_length), 16):
@@ -221,29 +219,203 @@ def md5_hexdigest(input_bytes):
 
 
 ##############################################################
-# テスト
+# 入力をコピーしないブロック単位の計算
+##############################################################
+
+# 64bytesのブロックを、入力をコピーせずに16wordsずつ取り出す
+# 64bytesに満たない末尾は取り出さない
+def iter_words(input_bytes):
+    view = memoryview(input_bytes).cast('B')
+    for offset in range(0, len(view) - 63, 64):
+        yield unpack_from('<16I', view, offset)
+
+
+# ステップ1, 2. 64bytesに満たない末尾にだけパディングと長さを付加し、
+# 最後の1〜2ブロック分のwordsを返す
+def last_words(rest_bytes, num_bits):
+    assert len(rest_bytes) < 64
+
+    padded_words = bytes_to_words(add_padding(rest_bytes))
+    padded_words_with_length = add_length(padded_words, num_bits)
+    return [padded_words_with_length[i:i+16] for i in range(0, len(padded_words_with_length), 16)]
+
+
+# MD5の計算（メモリ使用量は入力とほぼ同じ大きさで済む）
+def md5_hexdigest_by_blocks(input_bytes):
+    view = memoryview(input_bytes).cast('B')
+    num_full_bytes = len(view) // 64 * 64
+
+    # ステップ3. バッファの初期化
+    A, B, C, D = INITIAL_STATE
+
+    # ステップ4. 算出処理
+    for X in iter_words(view):
+        A, B, C, D = calculate_MD5_fast(X, A, B, C, D)
+    for X in last_words(bytes(view[num_full_bytes:]), len(view) * 8):
+        A, B, C, D = calculate_MD5_fast(X, A, B, C, D)
+
+    # ステップ5. 出力
+    return finalize(A, B, C, D)
+
+
+##############################################################
+# 逐次計算（hashlib互換のMD5オブジェクト）
+##############################################################
+
+# 入力全体をメモリに持たず、update()で渡された順にブロックを処理する。
+# 保持するのはバッファA, B, C, Dと入力の長さ、64bytesに満たない端数のみ。
+class MD5:
+    name = 'md5'
+    digest_size = 16
+    block_size = 64
+
+    def __init__(self, input_bytes=b''):
+        # ステップ3. バッファの初期化
+        self._state = INITIAL_STATE
+        self._length = 0
+        self._buffer = b''
+        if input_bytes:
+            self.update(input_bytes)
+
+    def update(self, input_bytes):
+        view = memoryview(input_bytes).cast('B')
+        self._length += len(view)
+        A, B, C, D = self._state
+
+        # 前回の端数があれば、先に64bytesまで埋めて処理する
+        if self._buffer:
+            num_fill_bytes = 64 - len(self._buffer)
+            self._buffer += bytes(view[:num_fill_bytes])
+            view = view[num_fill_bytes:]
+            if len(self._buffer) < 64:
+                return
+            A, B, C, D = calculate_MD5_fast(bytes_to_words(self._buffer), A, B, C, D)
+
+        # ステップ4. 算出処理（64bytes揃ったブロックはコピーせずに処理する）
+        for X in iter_words(view):
+            A, B, C, D = calculate_MD5_fast(X, A, B, C, D)
+        self._state = (A, B, C, D)
+        self._buffer = bytes(view[len(view) // 64 * 64:])
+
+    def digest(self):
+        # ステップ1, 2. 端数にだけパディングと長さを付加する（状態は変更しない）
+        A, B, C, D = self._state
+        for X in last_words(self._buffer, self._length * 8):
+            A, B, C, D = calculate_MD5_fast(X, A, B, C, D)
+
+        # ステップ5. 出力
+        return words_to_bytes((A, B, C, D))
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+    # 途中の状態を複製する（A, B, C, Dはintなのでコピーは定数時間）
+    def copy(self):
+        other = MD5.__new__(MD5)
+        other._state = self._state
+        other._length = self._length
+        other._buffer = self._buffer
+        return other
+
+    # 途中の状態をbytesに書き出す（別のプロセスや別のマシンで続きを計算するため）
+    # 形式：STATE_MAGIC, A, B, C, D（4bytesずつ）, 入力の長さ（8bytes）, 64bytesに満たない端数
+    # いずれもリトルエンディアン
+    def export_state(self):
+        return STATE_MAGIC + pack('<4IQ', *self._state, self._length) + self._buffer
+
+    # export_state()で書き出した状態から、MD5オブジェクトを作り直す
+    @classmethod
+    def from_state(cls, state):
+        state = bytes(state)
+        header_size = len(STATE_MAGIC) + STATE_STRUCT_SIZE
+        if state[:len(STATE_MAGIC)] != STATE_MAGIC or len(state) < header_size:
+            raise ValueError('not an MD5 state')
+        A, B, C, D, length = unpack_from('<4IQ', state, len(STATE_MAGIC))
+        buffer = state[header_size:]
+        if len(buffer) != length % 64:
+            raise ValueError('MD5 state is truncated or corrupted')
+
+        md5 = cls.__new__(cls)
+        md5._state = (A, B, C, D)
+        md5._length = length
+        md5._buffer = buffer
+        return md5
+
+
+STATE_MAGIC = b'MD5\x01'
+STATE_STRUCT_SIZE = 4 * 4 + 8
+
+
+##############################################################
+# 共通の先頭部分（prefix）の途中状態
+##############################################################
+
+# 同じprefixに対して何度も計算する場合、prefixまでのブロックは一度だけ計算し、
+# その途中状態（A, B, C, Dと入力の長さ、64bytesに満たない端数）を使い回す。
+# 返したMD5オブジェクトは共有されるので、続きを計算するときはcopy()してからupdate()する。
+def md5_prefix_state(prefix):
+    return MD5(prefix)
+
+
+# 最近使ったprefixの途中状態を、最大PREFIX_CACHE_SIZE個まで覚えておく（古いものから捨てる）
+PREFIX_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=PREFIX_CACHE_SIZE)
+def cached_prefix_state(prefix):
+    return md5_prefix_state(prefix)
+
+
+# prefix + suffix のMD5を、prefixの途中状態から計算する
+def md5_with_prefix(prefix, suffix):
+    md5 = cached_prefix_state(bytes(prefix)).copy()
+    md5.update(suffix)
+    return md5
+
+
+##############################################################
+# ファイルのMD5
 ##############################################################
 
-import hashlib
-
-
-def test_md5(string):
-    print("## '{0}'".format(string))
-    my_digest = md5_hexdigest(string.encode('utf-8'))
-    builtin_digest = hashlib.md5(string.encode('utf-8')).hexdigest()
-    print(my_digest)
-    print(builtin_digest)
-    print()
-    assert my_digest == builtin_digest
-
-
-test_md5("")
-test_md5("a")
-test_md5("abc")
-test_md5("message digest")
-test_md5("abcdefghijklmnopqrstuvwxyz")
-test_md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123")
-test_md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
-test_md5("12345678901234567890123456789012345678901234567890123456789012345678901234567890")
-test_md5("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
-test_md5("ああああああああああああああああああああああああ")
+# 通常のファイルは読み取り専用でmmapし、割り当てた領域から直接ブロックを取り出す
+# （read()でbytesにコピーせず、先読みはページキャッシュに任せる）。
+# mmapできないもの（パイプ、空のファイル、mmap非対応のファイルシステム）は通常の読み込みで計算する。
+#
+# md5に途中のMD5オブジェクト（MD5.from_state()で戻したものなど）を渡すと、
+# それまでに計算したバイト数の位置から続きを計算する。
+# checkpointを渡すと、checkpoint_bytesごとと最後に、export_state()の結果を渡して呼び出す。
+def md5_file(path, chunk_size=1024 * 1024, md5=None, checkpoint=None, checkpoint_bytes=1024 ** 3):
+    md5 = MD5() if md5 is None else md5
+    offset = md5._length
+    step = checkpoint_bytes if checkpoint is not None else None
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapped = None
+
+        if mapped is not None:
+            with mapped, memoryview(mapped) as view:
+                if hasattr(mapped, 'madvise'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                for start in range(offset, len(view), step or len(view)):
+                    md5.update(view[start:start + step] if step else view[start:])
+                    if checkpoint is not None:
+                        checkpoint(md5.export_state())
+        else:
+            if offset:
+                f.seek(offset)
+            # mmapの場合と同じく、checkpoint_bytesごとの境目と最後にcheckpointを呼ぶ
+            num_unsaved_bytes = 0
+            while True:
+                chunk = f.read(chunk_size if step is None else min(chunk_size, step - num_unsaved_bytes))
+                if not chunk:
+                    break
+                md5.update(chunk)
+                num_unsaved_bytes += len(chunk)
+                if step is not None and num_unsaved_bytes >= step:
+                    checkpoint(md5.export_state())
+                    num_unsaved_bytes = 0
+            if checkpoint is not None and num_unsaved_bytes:
+                checkpoint(md5.export_state())
+    return md5
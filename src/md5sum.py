@@ -0,0 +1,226 @@
+"""
+md5_with_intのMD5で、coreutilsのmd5sumと同じ形式の出力・検証を行うコマンド
+
+使い方：
+  python md5sum.py FILE_OR_DIR...        # ディレクトリは再帰的にたどる
+  python md5sum.py -c MANIFEST           # md5sumの出力を検証する
+  python md5sum.py -j 8 --stats DIR      # 8プロセスで計算し、処理速度を表示する
+  python md5sum.py --cache md5cache.sqlite3 DIR   # 前回から変わっていないファイルは計算しない
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from md5_manifest import ManifestCache
+from md5_with_int import MD5, md5_file
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+# ファイル1つ分のMD5を計算し、(16進数のダイジェスト, バイト数) を返す
+def hash_file(path):
+    return md5_file(path).hexdigest(), os.path.getsize(path)
+
+
+def hash_stream(f):
+    md5 = MD5()
+    size = 0
+    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+        md5.update(chunk)
+        size += len(chunk)
+    return md5.hexdigest(), size
+
+
+# 引数のファイルとディレクトリを、ファイルの並びに展開する
+def iter_paths(args):
+    for arg in args:
+        if os.path.isdir(arg):
+            for root, dirs, files in os.walk(arg):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield arg
+
+
+# md5sumと同じく、\ と改行を含むファイル名はエスケープして行頭に \ を付ける
+def format_line(hex_hash, path):
+    if '\\' in path or '\n' in path:
+        return '\\{0}  {1}'.format(hex_hash, path.replace('\\', '\\\\').replace('\n', '\\n'))
+    return '{0}  {1}'.format(hex_hash, path)
+
+
+ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+HEX_HASH_PATTERN = re.compile('[0-9a-fA-F]{32}')
+
+
+def parse_line(line):
+    escaped = line.startswith('\\')
+    if escaped:
+        line = line[1:]
+    hex_hash, sep, path = line[:32], line[32:34], line[34:]
+    if not HEX_HASH_PATTERN.fullmatch(hex_hash) or sep not in ('  ', ' *'):
+        return None
+    if escaped:
+        # 左から順に戻す（\\n は \ と n であり、改行ではない）
+        path = ESCAPE_PATTERN.sub(lambda m: '\n' if m.group(1) == 'n' else m.group(1), path)
+    return hex_hash.lower(), path
+
+
+# 大きいファイルから順に投入し、結果は入力の順に返す
+# cache（ManifestCache）を渡すと、前回から変わっていないファイルは保存したダイジェストを使う
+def hash_files(executor, paths, cache=None):
+    def file_size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    cached = {}
+    stats_before = {}
+    if cache is not None:
+        for path in set(paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            hex_hash = cache.lookup(st)
+            if hex_hash is None:
+                stats_before[path] = st
+            else:
+                cached[path] = (hex_hash, st.st_size)
+                cache.bytes_skipped += st.st_size
+
+    futures = {}
+    for path in sorted(set(paths) - set(cached), key=file_size, reverse=True):
+        futures[path] = executor.submit(hash_file, path)
+    for path in paths:
+        if path in cached:
+            yield path, cached[path], None
+            continue
+        try:
+            result = futures[path].result()
+        except OSError as e:
+            yield path, None, e
+            continue
+        st = stats_before.pop(path, None)
+        if st is not None:
+            cache.bytes_hashed += st.st_size
+            cache.store(path, st, result[0])
+        yield path, result, None
+
+
+# 結果は引数の順に出力する（- の位置で標準入力を計算する）
+def run_hash(executor, args, stats, cache=None):
+    paths = list(iter_paths(args))
+    results = hash_files(executor, [p for p in paths if p != '-'], cache)
+    status = 0
+    for path in paths:
+        if path == '-':
+            hex_hash, size = hash_stream(sys.stdin.buffer)
+            stats[0] += size
+            print(format_line(hex_hash, '-'))
+            continue
+        path, result, error = next(results)
+        if error is not None:
+            print('md5sum: {0}: {1}'.format(path, error.strerror), file=sys.stderr)
+            status = 1
+            continue
+        hex_hash, size = result
+        stats[0] += size
+        print(format_line(hex_hash, path))
+    return status
+
+
+def run_check(executor, manifests, quiet, stats, cache=None):
+    entries = []
+    num_improper = 0
+    # 開けないリストは、エラーを表示して次のリストに進む（終了コードは1にする）
+    num_missing = 0
+    for manifest in manifests:
+        try:
+            f = sys.stdin if manifest == '-' else open(manifest, encoding='utf-8', errors='surrogateescape')
+        except OSError as e:
+            print('md5sum: {0}: {1}'.format(manifest, e.strerror), file=sys.stderr)
+            num_missing += 1
+            continue
+        try:
+            for line in f:
+                entry = parse_line(line.rstrip('\n'))
+                if entry is None:
+                    num_improper += 1
+                else:
+                    entries.append(entry)
+        finally:
+            # 標準入力は閉じない
+            if f is not sys.stdin:
+                f.close()
+
+    num_failed = 0
+    num_unreadable = 0
+    paths = [path for _, path in entries]
+    for (expected, _), (path, result, error) in zip(entries, hash_files(executor, paths, cache)):
+        if error is not None:
+            print('md5sum: {0}: {1}'.format(path, error.strerror), file=sys.stderr)
+            print('{0}: FAILED open or read'.format(path))
+            num_unreadable += 1
+            continue
+        hex_hash, size = result
+        stats[0] += size
+        if hex_hash == expected:
+            if not quiet:
+                print('{0}: OK'.format(path))
+        else:
+            print('{0}: FAILED'.format(path))
+            num_failed += 1
+
+    if num_improper:
+        print('md5sum: WARNING: {0} line(s) improperly formatted'.format(num_improper), file=sys.stderr)
+    if num_unreadable:
+        print('md5sum: WARNING: {0} listed file(s) could not be read'.format(num_unreadable), file=sys.stderr)
+    if num_failed:
+        print('md5sum: WARNING: {0} computed checksum(s) did NOT match'.format(num_failed), file=sys.stderr)
+    return 1 if num_failed or num_unreadable or num_missing or (num_improper and not entries) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='md5sum', description='Print or check MD5 checksums.')
+    parser.add_argument('files', nargs='*', default=['-'])
+    parser.add_argument('-c', '--check', action='store_true', help='read MD5 sums from the FILEs and check them')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--quiet', action='store_true', help="don't print OK for each successfully verified file")
+    parser.add_argument('--stats', action='store_true', help='print total bytes and MB/s to stderr')
+    parser.add_argument('--cache', metavar='DB', default=None,
+                        help='SQLite database of digests; unchanged files are not hashed again')
+    args = parser.parse_args(argv)
+
+    stats = [0]
+    cache = None if args.cache is None else ManifestCache(args.cache)
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            if args.check:
+                status = run_check(executor, args.files, args.quiet, stats, cache)
+            else:
+                status = run_hash(executor, args.files, stats, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+
+    if args.stats:
+        print('md5sum: {0} bytes in {1:.3f} s ({2:.2f} MB/s)'.format(
+            stats[0], elapsed, stats[0] / 1e6 / elapsed if elapsed else 0.0), file=sys.stderr)
+        if cache is not None:
+            print('md5sum: {0} bytes hashed, {1} bytes skipped (cache)'.format(
+                cache.bytes_hashed, cache.bytes_skipped), file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,538 @@
+"""
+各実装をhashlibの結果と比べるテスト
+
+  python -m pytest src/test_md5.py
+  python src/test_md5.py
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+
+import md5
+import md5_with_int
+from md5_with_int import MD5, md5_file, md5_hexdigest, md5_hexdigest_by_blocks, md5_with_prefix
+
+
+STRINGS = [
+    "",
+    "a",
+    "abc",
+    "message digest",
+    "abcdefghijklmnopqrstuvwxyz",
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123",
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+    "12345678901234567890123456789012345678901234567890123456789012345678901234567890",
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+    "ああああああああああああああああああああああああ",
+]
+
+
+def check_md5_with_int(string):
+    input_bytes = string.encode('utf-8')
+    builtin_digest = hashlib.md5(input_bytes).hexdigest()
+    assert md5_hexdigest(input_bytes) == builtin_digest
+    assert md5_hexdigest_by_blocks(input_bytes) == builtin_digest
+
+    # 1byteずつ渡しても、途中でcopy()しても同じ結果になること
+    md5 = MD5()
+    for i in range(len(input_bytes)):
+        md5.update(input_bytes[i:i+1])
+        if i == len(input_bytes) // 2:
+            forked = md5.copy()
+    assert md5.hexdigest() == builtin_digest
+    assert MD5(input_bytes).hexdigest() == builtin_digest
+    if len(input_bytes) > 1:
+        forked.update(b'x')
+        assert md5.hexdigest() == builtin_digest
+        # copy()した側は、copy()した時点までの入力の続きとして計算すること
+        assert forked.hexdigest() == hashlib.md5(input_bytes[:len(input_bytes) // 2 + 1] + b'x').hexdigest()
+
+
+def test_md5_with_int():
+    for string in STRINGS:
+        check_md5_with_int(string)
+
+
+def test_md5_file():
+    with open(__file__, 'rb') as f:
+        assert md5_file(__file__).hexdigest() == hashlib.md5(f.read()).hexdigest()
+
+
+# 途中の状態を書き出して戻しても、続きから同じ結果になること
+def test_md5_export_state():
+    data = bytes(range(256)) * 3
+    for split in [0, 1, 63, 64, 65, len(data)]:
+        md5 = MD5(data[:split])
+        restored = MD5.from_state(md5.export_state())
+        restored.update(data[split:])
+        assert restored.hexdigest() == hashlib.md5(data).hexdigest()
+
+
+def test_md5_file_resume():
+    with open(__file__, 'rb') as f:
+        data = f.read()
+    states = []
+    md5_file(__file__, checkpoint=states.append, checkpoint_bytes=1000)
+    assert len(states) == (len(data) + 999) // 1000
+    md5 = md5_file(__file__, md5=MD5.from_state(states[0]))
+    assert md5.hexdigest() == hashlib.md5(data).hexdigest()
+
+
+# mmapできない場合の通常の読み込みでも、同じ位置でcheckpointを呼び、続きから計算できること
+def test_md5_file_resume_without_mmap():
+    import mmap
+
+    def no_mmap(*args, **kwargs):
+        raise OSError('mmap is disabled')
+
+    with open(__file__, 'rb') as f:
+        data = f.read()
+    mapped_states = []
+    md5_file(__file__, checkpoint=mapped_states.append, checkpoint_bytes=1000)
+
+    original = mmap.mmap
+    mmap.mmap = no_mmap
+    try:
+        states = []
+        md5_file(__file__, chunk_size=300, checkpoint=states.append, checkpoint_bytes=1000)
+        assert states == mapped_states
+        md5 = md5_file(__file__, chunk_size=300, md5=MD5.from_state(states[0]))
+    finally:
+        mmap.mmap = original
+    assert md5.hexdigest() == hashlib.md5(data).hexdigest()
+
+
+def test_md5_with_prefix():
+    salt = b'salt' * 40
+    for suffix in [b'', b'a', b'x' * 100]:
+        assert md5_with_prefix(salt, suffix).hexdigest() == hashlib.md5(salt + suffix).hexdigest()
+    # 途中状態を共有していても、前の計算の影響を受けないこと
+    assert md5_with_prefix(salt, b'a').hexdigest() == hashlib.md5(salt + b'a').hexdigest()
+    assert md5_with_int.cached_prefix_state.cache_info().hits >= 3
+
+
+def test_md5_async():
+    import asyncio
+    import base64
+
+    from md5_async import content_md5, md5_async
+
+    body = os.urandom(300000)
+
+    async def chunks():
+        for i in range(0, len(body), 10000):
+            yield body[i:i+10000]
+
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(body)
+        reader.feed_eof()
+        md5 = await md5_async(reader, batch_size=64 * 1024)
+        assert md5.hexdigest() == hashlib.md5(body).hexdigest()
+        assert await content_md5(chunks(), batch_size=64 * 1024) == \
+            base64.b64encode(hashlib.md5(body).digest()).decode('ascii')
+
+    asyncio.run(main())
+
+
+def test_profile():
+    from md5_profile import profile
+
+    data = bytes(range(256)) * 4
+    with profile(md5_with_int, md5) as stats:
+        assert md5_with_int.md5_hexdigest(data) == hashlib.md5(data).hexdigest()
+        assert MD5(data).hexdigest() == hashlib.md5(data).hexdigest()
+        assert md5.md5_hexdigest(data) == hashlib.md5(data).hexdigest()
+    assert stats.stages['md5_with_int.block'].blocks == 2 * (len(data) // 64 + 1)
+    assert stats.stages['md5.block'].blocks == len(data) // 64 + 1
+    assert 'md5_with_int.block' in stats.report()
+
+    # withを抜けたら元の関数に戻っていること
+    assert md5_with_int.calculate_MD5.__name__ == 'calculate_MD5'
+    assert md5_with_int.calculate_MD5_fast.__name__ == 'calculate_MD5_fast'
+    assert md5.culuculate_MD5.__name__ == 'culuculate_MD5'
+
+
+def test_digest_cache():
+    from md5_cache import DigestCache
+
+    cache = DigestCache(max_entries=2, max_bytes=10000, max_input_size=8000, identity_threshold=100)
+    small, large, too_large = b'config', b'x' * 5000, b'y' * 9000
+    for data in [small, small, large, large, too_large]:
+        assert cache(data) == hashlib.md5(data).hexdigest()
+    assert (cache.hits, cache.misses, cache.bypasses) == (2, 2, 1)
+
+    # 中身が同じでも別のオブジェクトなら、大きい入力はidが違うので計算し直す
+    assert cache(large[:-1] + b'x') == hashlib.md5(large).hexdigest()
+    assert cache.misses == 3
+    # 入力の数と合計バイト数の上限を超えないこと
+    cache(b'z' * 5000)
+    assert len(cache) <= 2 and cache.num_bytes <= 10000
+
+
+def test_md5sum_escaping():
+    from md5sum import format_line, parse_line
+
+    hex_hash = hashlib.md5(b'').hexdigest()
+    for path in ['plain.txt', 'back\\slash', 'new\nline', '\\\n\\n']:
+        line = format_line(hex_hash, path)
+        assert '\n' not in line
+        assert line.startswith('\\') == ('\\' in path or '\n' in path)
+        assert parse_line(line) == (hex_hash, path)
+    assert parse_line('not a checksum line') is None
+    # ハッシュの部分が16進数32桁でなければ、正しい形式の行としない
+    assert parse_line('z' * 32 + '  file') is None
+    assert parse_line(hex_hash.upper() + '  file') == (hex_hash, 'file')
+
+
+def run_md5sum(args, input_bytes=b''):
+    src_dir = os.path.dirname(os.path.abspath(md5_with_int.__file__))
+    return subprocess.run([sys.executable, os.path.join(src_dir, 'md5sum.py'), '-j', '1'] + args,
+                          input=input_bytes, capture_output=True)
+
+
+def test_md5sum():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        a_path, b_path = os.path.join(tmp_dir, 'a'), os.path.join(tmp_dir, 'b')
+        for path in (a_path, b_path):
+            with open(path, 'wb') as f:
+                f.write(path.encode('utf-8'))
+
+        # 標準入力（-）も含め、引数の順に出力すること
+        result = run_md5sum([a_path, '-', b_path], b'hi\n')
+        assert result.returncode == 0
+        assert result.stdout.decode('utf-8').splitlines() == [
+            '{0}  {1}'.format(hashlib.md5(a_path.encode('utf-8')).hexdigest(), a_path),
+            '{0}  -'.format(hashlib.md5(b'hi\n').hexdigest()),
+            '{0}  {1}'.format(hashlib.md5(b_path.encode('utf-8')).hexdigest(), b_path),
+        ]
+
+        manifest = run_md5sum([a_path, b_path]).stdout
+        result = run_md5sum(['-c', '-'], manifest)
+        assert result.returncode == 0
+        assert result.stdout.decode('utf-8').splitlines() == [a_path + ': OK', b_path + ': OK']
+        # 標準入力を閉じないので、- を2回指定しても失敗しないこと
+        assert run_md5sum(['-c', '-', '-'], manifest).returncode == 0
+
+        with open(a_path, 'ab') as f:
+            f.write(b'x')
+        os.remove(b_path)
+        result = run_md5sum(['-c', '--quiet', '-'], manifest)
+        assert result.returncode == 1
+        assert result.stdout.decode('utf-8').splitlines() == [a_path + ': FAILED', b_path + ': FAILED open or read']
+
+        # 正しい形式の行が1つもなければ失敗すること
+        result = run_md5sum(['-c', '-'], b'garbage\n')
+        assert result.returncode == 1
+        assert b'improperly formatted' in result.stderr
+
+        # 開けないリストはエラーを表示して飛ばし、残りのリストは確かめること
+        missing_path = os.path.join(tmp_dir, 'missing.md5')
+        result = run_md5sum(['-c', missing_path, '-'], manifest)
+        assert result.returncode == 1
+        assert 'md5sum: {0}: No such file or directory'.format(missing_path) in result.stderr.decode('utf-8')
+        assert b'Traceback' not in result.stderr
+        assert result.stdout.decode('utf-8').splitlines() == [a_path + ': FAILED', b_path + ': FAILED open or read']
+
+
+def test_multipart_etag():
+    from md5_etag import multipart_etag
+
+    with open(__file__, 'rb') as f:
+        data = f.read()
+    part_size = 1000
+    parts = [hashlib.md5(data[i:i+part_size]).digest() for i in range(0, len(data), part_size)]
+    expected = '{0}-{1}'.format(hashlib.md5(b''.join(parts)).hexdigest(), len(parts))
+    assert multipart_etag(__file__, part_size=part_size, max_workers=2) == expected
+    assert multipart_etag(__file__, part_size=len(data) + 1) == hashlib.md5(data).hexdigest()
+
+
+def test_hash_records():
+    import csv
+    import io
+
+    from md5_records import hash_records, iter_csv_column, iter_records
+
+    lines = [b'line %d' % i for i in range(100)]
+    f = io.BytesIO(b'\n'.join(lines) + b'\n')
+    pairs = list(hash_records(iter_records(f, chunk_size=7), batch_size=30))
+    assert [record for record, _ in pairs] == lines
+    assert all(digest == hashlib.md5(record).digest() for record, digest in pairs)
+    # chunk_sizeより長いレコードや、チャンクの境目にまたがる区切り文字があっても、同じように分けること
+    records = [b'short', os.urandom(5000).replace(b'\r\n', b''), b'', b'last']
+    data = b'\r\n'.join(records)
+    for chunk_size in (1, 2, 3, 7, 1000, len(data)):
+        assert list(iter_records(io.BytesIO(data), chunk_size, b'\r\n')) == records, chunk_size
+
+    # 空行は飛ばし、列が足りない行はその列を空として計算すること
+    rows = csv.reader(io.StringIO('a,b\n\n1,2\n3\n'))
+    pairs = list(hash_records(iter_csv_column(rows, 1), batch_size=2, key=lambda pair: pair[1]))
+    assert [(row, digest) for (row, _), digest in pairs] == [
+        (['a', 'b'], hashlib.md5(b'b').digest()),
+        (['1', '2'], hashlib.md5(b'2').digest()),
+        (['3'], hashlib.md5(b'').digest()),
+    ]
+
+
+def test_digest_index():
+    import tempfile
+
+    import md5_index
+    from md5_index import DigestIndex, build_index
+
+    words = [b'word%d' % i for i in range(1000)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        wordlist_path = os.path.join(tmp_dir, 'words.txt')
+        index_path = os.path.join(tmp_dir, 'words.idx')
+        with open(wordlist_path, 'wb') as f:
+            f.write(b'\r\n'.join(words))
+        assert build_index(wordlist_path, index_path, max_workers=2, range_size=1000) == len(words)
+        with DigestIndex(wordlist_path, index_path) as index:
+            for word in [words[0], words[500], words[-1]]:
+                assert index.lookup(hashlib.md5(word).digest()) == word
+            assert index.lookup(hashlib.md5(b'missing').digest()) is None
+
+        # ランが多いときは、何段かに分けて併合しても同じインデックスになること
+        with open(index_path, 'rb') as f:
+            expected = f.read()
+        max_merge_runs = md5_index.MAX_MERGE_RUNS
+        md5_index.MAX_MERGE_RUNS = 2
+        try:
+            assert build_index(wordlist_path, index_path, max_workers=2, range_size=1000) == len(words)
+        finally:
+            md5_index.MAX_MERGE_RUNS = max_merge_runs
+        with open(index_path, 'rb') as f:
+            assert f.read() == expected
+
+        # 空の単語リストからも、開いて検索できるインデックスを作れること
+        empty_path = os.path.join(tmp_dir, 'empty.txt')
+        open(empty_path, 'wb').close()
+        assert build_index(empty_path, index_path) == 0
+        with DigestIndex(empty_path, index_path) as index:
+            assert len(index) == 0
+            assert index.lookup(hashlib.md5(b'').digest()) is None
+
+
+def test_find_duplicates():
+    import tempfile
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from md5_dedup import PARTIAL_SIZE, find_duplicates, full_digest, partial_digest, split_groups
+
+    large = os.urandom(3 * PARTIAL_SIZE)
+    # 先頭と末尾は同じで、途中だけ違うファイル
+    changed = large[:PARTIAL_SIZE] + b'x' * PARTIAL_SIZE + large[-PARTIAL_SIZE:]
+    contents = {'a': large, 'b': large, 'c': changed, 'd': b'small', 'e': b'small', 'f': b'other'}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, data in contents.items():
+            with open(os.path.join(tmp_dir, name), 'wb') as f:
+                f.write(data)
+        duplicates, (read_bytes, total_bytes) = find_duplicates([tmp_dir], max_workers=2)
+        names = sorted(sorted(os.path.basename(path) for path in paths) for paths in duplicates)
+        assert names == [['a', 'b'], ['d', 'e']]
+        # 先頭と末尾を3つずつ、ファイル全体を3つ（重複がなかったcも含む）、小さいファイルを3つ読むこと
+        assert read_bytes == 3 * 2 * PARTIAL_SIZE + 3 * 3 * PARTIAL_SIZE + 3 * 5
+        assert total_bytes == sum(len(data) for data in contents.values())
+
+        # 途中で削除されたファイルは、全体を止めずにグループから除くこと
+        paths = [os.path.join(tmp_dir, name) for name in ('a', 'b', 'missing')]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert split_groups(executor, full_digest, [paths]) == [paths[:2]]
+            assert split_groups(executor, partial_digest, [paths], lambda path: len(large)) == [paths[:2]]
+
+
+def test_manifest_cache():
+    import tempfile
+
+    from md5_manifest import ManifestCache
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, name) for name in ('a', 'b')]
+        for path in paths:
+            with open(path, 'wb') as f:
+                f.write(os.urandom(1000))
+        db_path = os.path.join(tmp_dir, 'cache.sqlite3')
+        with ManifestCache(db_path) as cache:
+            for path in paths:
+                cache.hexdigest(path)
+        with ManifestCache(db_path) as cache:
+            # 変更していないファイルは計算せず、書き換えたファイルだけ計算し直すこと
+            with open(paths[0], 'ab') as f:
+                f.write(b'x')
+            for path in paths:
+                with open(path, 'rb') as f:
+                    assert cache.hexdigest(path) == hashlib.md5(f.read()).hexdigest()
+            assert (cache.bytes_hashed, cache.bytes_skipped) == (1001, 1000)
+
+            # UTF-8で表せないファイル名も保存でき、削除したらpruneで消えること
+            odd_path = os.fsdecode(os.path.join(os.fsencode(tmp_dir), b'caf\xe9'))
+            with open(odd_path, 'wb') as f:
+                f.write(b'odd')
+            assert cache.hexdigest(odd_path) == hashlib.md5(b'odd').hexdigest()
+            assert cache.hexdigest(odd_path) == hashlib.md5(b'odd').hexdigest()
+            assert cache.bytes_skipped == 1003
+
+            os.remove(paths[1])
+            os.remove(odd_path)
+            assert cache.prune() == 2
+            assert cache.prune() == 0
+
+
+def test_hmac_md5():
+    import hmac
+
+    from md5_hmac import HMAC_MD5, hmac_md5, verify
+
+    # RFC 2104のテストベクタと、ブロックより長い鍵
+    keys = [b'\x0b' * 16, b'Jefe', b'\xaa' * 16, os.urandom(80)]
+    for key in keys:
+        for string in STRINGS:
+            msg = string.encode('utf-8')
+            expected = hmac.new(key, msg, 'md5').digest()
+            assert hmac_md5(key, msg) == expected
+            assert verify(key, msg, expected)
+            assert not verify(key, msg + b'x', expected)
+
+            mac = HMAC_MD5(key, msg[:5])
+            copied = mac.copy()
+            mac.update(msg[5:])
+            assert mac.digest() == expected
+            assert copied.digest() == hmac.new(key, msg[:5], 'md5').digest()
+    assert hmac_md5(b'Jefe', b'what do ya want for nothing?').hex() == '750c783e6ab0b503eaa86e310a5db738'
+
+
+def test_trace():
+    from md5_trace import trace
+
+    data = bytes(range(256)) * 2
+    with trace(md5_with_int, depth=64 * 10) as tracer:
+        assert md5_with_int.md5_hexdigest(data) == hashlib.md5(data).hexdigest()
+        assert MD5(data).hexdigest() == hashlib.md5(data).hexdigest()
+    with trace(md5) as reference:
+        assert md5.md5_hexdigest(data) == hashlib.md5(data).hexdigest()
+    # withを抜けたら元の関数に戻っていること
+    assert md5_with_int.calculate_MD5_fast.__name__ == 'calculate_MD5_fast'
+    assert md5.FF.__name__ == 'FF'
+
+    # 9ブロックを2回処理したうち、最新の10ブロック分だけが残っていること
+    records = tracer.export()
+    assert len(records) == 64 * 10
+    assert records[0][:2] == (8, 1) and records[-1][:2] == (17, 64)
+
+    # md5.pyの各ステップのバッファと一致すること
+    reference_records = reference.export()
+    assert len(reference_records) == 64 * 9
+    assert [r[1:] for r in records[64:]] == [r[1:] for r in reference_records]
+
+    # 最初のブロックの最後のステップのバッファに初期値を足すと、そのブロックの後の状態になること
+    A, B, C, D = reference_records[63][2:]
+    AA, BB, CC, DD = md5_with_int.INITIAL_STATE
+    state = tuple((x + y) & 0xFFFFFFFF for x, y in zip((A, B, C, D), (AA, BB, CC, DD)))
+    assert state == MD5(data[:64])._state
+
+
+def test_md5_backend():
+    import md5_backend
+
+    messages = [os.urandom(n) for n in range(100)]
+    for data in messages[:10]:
+        assert md5_backend.md5(data).hexdigest() == hashlib.md5(data).hexdigest()
+    assert md5_backend.md5_many(messages) == [hashlib.md5(data).digest() for data in messages]
+    assert 'selected' in md5_backend.selection.values()
+    md5_batch = md5_backend.select_batch_backend()
+    if md5_batch is not None:
+        assert [row.tobytes() for row in md5_batch(messages)] == [hashlib.md5(data).digest() for data in messages]
+
+    # 全ての実装がテストベクタを正しく計算できること
+    for name, new in md5_backend.BACKENDS:
+        assert md5_backend.check_backend(new) is None, name
+    # 間違った結果を返す実装や、使えない実装は選ばれないこと
+    assert md5_backend.check_backend(lambda data=b'': MD5(data + b'x')) is not None
+    assert md5_backend.check_backend(lambda data=b'': hashlib.new('no-such-hash')) is not None
+
+    # どんな例外を投げる実装でも、例外を外に出さずに理由を返すこと
+    def broken(data=b''):
+        raise RuntimeError('broken')
+    assert md5_backend.check_backend(broken) == 'RuntimeError: broken'
+
+
+def test_content_defined_chunks():
+    import io
+
+    from md5_chunker import iter_chunks
+
+    data = os.urandom(200000)
+    chunks = list(iter_chunks(io.BytesIO(data), 256, 1024, 4096, read_size=1000))
+    # チャンクが隙間なくファイル全体を覆い、大きさが上限以下で、ダイジェストが正しいこと
+    assert [offset for offset, _, _ in chunks] == [sum(length for _, length, _ in chunks[:n]) for n in range(len(chunks))]
+    assert sum(length for _, length, _ in chunks) == len(data)
+    assert all(256 <= length <= 4096 for _, length, _ in chunks[:-1])
+    assert all(digest == hashlib.md5(data[offset:offset + length]).digest() for offset, length, digest in chunks)
+
+    # 先頭にデータを挿入しても、それ以降のチャンクのほとんどは同じになること
+    shifted = list(iter_chunks(io.BytesIO(b'inserted' + data), 256, 1024, 4096))
+    digests = {digest for _, _, digest in chunks}
+    assert sum(digest in digests for _, _, digest in shifted) >= len(chunks) - 3
+
+
+def test_md5():
+    for string in STRINGS:
+        assert md5.md5_hexdigest(string) == hashlib.md5(string.encode('utf-8')).hexdigest()
+
+
+def test_md5_bit_operations():
+    # ビット長を指定すると揃えてから計算し、指定しなければ先頭の0を付けない
+    assert md5.AND('1100', '1010') == '1000'
+    assert md5.AND('1100', '0011') == '0'
+    assert md5.OR('1100', '11', 8) == '00001111'
+    assert md5.XOR('111100001', '0101', 4) == '0100'
+    assert md5.NOT('0011') == '1100'
+    assert md5.NOT('11', 4) == '1100'
+    assert md5.L_ROTATE('10000000', 3) == '00000100'
+    assert md5.L_ROTATE('1011', 6) == '1110'
+    assert md5.R_ROTATE('00000100', 3) == '10000000'
+    assert md5.L_ROTATE('1', 5) == '1'
+    assert md5.reverse_bits('10001011010111011100101101010011') == '01010011110010110101110110001011'
+
+
+def test_md5_numpy():
+    try:
+        import md5_numpy
+    except ImportError:
+        return
+    messages = [string.encode('utf-8') for string in STRINGS]
+    for message, digest in zip(messages, md5_numpy.md5_batch(messages)):
+        assert digest.tobytes() == hashlib.md5(message).digest()
+    # 長さの違うメッセージがたくさんあっても、入力の順に返すこと
+    keys = [b'key:%d' % n * (n % 20) for n in range(1000)]
+    assert [row.tobytes() for row in md5_numpy.md5_batch(keys)] == [hashlib.md5(key).digest() for key in keys]
+
+
+# md5_unrolled.py が gen_md5_unrolled.py の出力と一致していること
+def test_md5_unrolled_is_up_to_date():
+    import gen_md5_unrolled
+    import md5_unrolled
+
+    with open(md5_unrolled.__file__, encoding='utf-8') as f:
+        assert f.read() == gen_md5_unrolled.generate()
+
+
+# importしただけでは何も出力しないこと
+def test_import_has_no_side_effects():
+    src_dir = os.path.dirname(os.path.abspath(md5_with_int.__file__))
+    result = subprocess.run(
+        [sys.executable, '-c', 'import md5, md5_with_int, md5_for_learning, md5_core'],
+        cwd=src_dir, capture_output=True, text=True, check=True)
+    assert result.stdout == ''
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print('{0}: OK'.format(name))